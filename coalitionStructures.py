@@ -0,0 +1,35 @@
+"""Find the equilibria of a conflict under every coalition structure.
+
+Usage:
+    python coalitionStructures.py conflict.gmcr [-w WORKERS] [-c CONCEPT ...]
+
+Every partition of the decision makers into coalitions is solved, and a
+table of the equilibrium states (as ordered state numbers) is printed.
+"""
+
+import argparse
+
+from data_01_conflictModel import ConflictModel
+from data_02_conflictSolvers import solveCoalitionStructures
+
+
+def main():
+    """Run from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Equilibria of a conflict under every coalition "
+                    "structure.")
+    parser.add_argument('file', help="conflict file (.gmcr)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="number of processes to solve with")
+    parser.add_argument('-c', '--concepts', nargs='+', default=None,
+                        help="stability concepts to solve for (default all)")
+    args = parser.parse_args()
+
+    conflict = ConflictModel()
+    conflict.load_from_file(args.file)
+    table = solveCoalitionStructures(conflict, args.workers, args.concepts)
+    print(table.format())
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,9 @@
 """Core data model and class definitions for GMCR-py."""
 
 import json
+import itertools
+import operator
+import numpy
 import data_03_gmcrUtilities as gmcrUtil
 from version import __version__
 
@@ -53,6 +56,9 @@ class DecisionMaker:
         self.misperceptions = ConditionList(conflict)
         self.perceived = FeasibleList()
 
+        # reachability and preference data cached by the solvers
+        self.solverData = None
+
     def __str__(self):
         """Return string representation of the DM."""
         return self.name
@@ -98,9 +104,10 @@ class DecisionMaker:
     def weightPreferences(self):
         """Assign sequential weights to DM preferences.
 
-        Weights are powers of 2, guaranteeing that states satisfying more
+        Weights are powers of 2, reflecting that states satisfying more
         important preferences are ranked higher than those satisfying less
-        important preferences.
+        important preferences. They are for display only; the ranking itself
+        is calculated lexicographically by prefPriorities2payoffs.
         """
         for idx, pref in enumerate(self.preferences):
             pref.weight = 2**(len(self.preferences) - idx - 1)
@@ -142,13 +149,18 @@ class DecisionMaker:
 
     def calculatePerceived(self):
         """Calculate states perceived by the DM based on misperceptions."""
-        percDash = self.conflict.feasibles.dash
+        numOpts = len(self.conflict.options)
+        percMasks = [gmcrUtil.MaskPattern.fromYND(pat)
+                     for pat in self.conflict.feasibles.dash]
         for misp in self.misperceptions:
-            res = gmcrUtil.rmvSt(percDash, misp.ynd())
-            percDash = res[0]
+            res = gmcrUtil.rmvMask(percMasks,
+                                   gmcrUtil.MaskPattern.fromYND(misp.ynd()),
+                                   numOpts)
+            percMasks = res[0]
             misp.statesRemoved = res[1]
         toOrd = self.conflict.feasibles.toOrdered
-        self.perceived = FeasibleList(percDash, toOrdered=toOrd)
+        self.perceived = FeasibleList([m.ynd(numOpts) for m in percMasks],
+                                      toOrdered=toOrd)
         self.misperceived = [st for st in self.conflict.feasibles.ordered
                              if st not in self.perceived.ordered]
 
@@ -170,6 +182,8 @@ class Condition:
             self.taken.append(taken)
         self.name = self.ynd()
         self.isCompound = False
+        self._compiled = None
+        self._compiledKey = None
 
     def __str__(self):
         """String representation of the condition."""
@@ -191,17 +205,38 @@ class Condition:
             ynd[opt.master_index] = taken
         return ''.join(ynd)
 
+    def compile(self):
+        """Return the Condition as a MaskPattern over the conflict's options.
+
+        The result is cached, and rebuilt automatically if the conflict's
+        options or the Condition itself have changed since.
+        """
+        key = (self.conflict.options.version, self.options.version,
+               tuple(self.taken))
+        if key != self._compiledKey:
+            self.conflict.options.set_indexes()
+            care = value = 0
+            for opt, taken in self.cond():
+                care |= opt.dec_val
+                if taken == 'Y':
+                    value |= opt.dec_val
+            self._compiled = gmcrUtil.MaskPattern(care, value)
+            self._compiledKey = key
+        return self._compiled
+
     def test(self, state):
         """Test against a decimal state.
 
         Returns True if state satisfies the Condition.
         """
-        self.conflict.options.set_indexes()
-        state = gmcrUtil.dec2yn(state, len(self.conflict.options))
-        for opt, taken in self.cond():
-            if state[opt.master_index] != taken:
-                return False
-        return True
+        return self.compile().test(state)
+
+    def test_many(self, codes):
+        """Test against an array of decimal states.
+
+        Returns a boolean array, True where the state satisfies the Condition.
+        """
+        return gmcrUtil.testMasks([self.compile()], codes)
 
     def isValid(self):
         """Check all options in the Condition are defined in the conflict."""
@@ -262,17 +297,29 @@ class CompoundCondition:
         """Return the compound condition as a list of items in YND notation."""
         return [cond.ynd() for cond in self.conditions]
 
+    def compile(self):
+        """Return the component conditions as a list of MaskPatterns."""
+        return [cond.compile() for cond in self.conditions]
+
     def test(self, state):
         """Test against a decimal state.
 
         Returns True if state satisfies one or more of the component
         conditions.
         """
-        for cond in self.conditions:
-            if cond.test(state):
+        for mask in self.compile():
+            if mask.test(state):
                 return True
         return False
 
+    def test_many(self, codes):
+        """Test against an array of decimal states.
+
+        Returns a boolean array, True where the state satisfies one or more of
+        the component conditions.
+        """
+        return gmcrUtil.testMasks(self.compile(), codes)
+
     def isValid(self):
         """Check all options in the Condition are defined in the conflict."""
         for cond in self.conditions:
@@ -288,12 +335,23 @@ class CompoundCondition:
 
 
 class ObjectList:
-    """A base class for lists of DMs/options. Defines useful magic methods."""
+    """A base class for lists of DMs/options. Defines useful magic methods.
+
+    The version attribute is given a new, globally unique value whenever the
+    list is modified, allowing dependent data to detect when it is stale.
+    """
+
+    _versions = itertools.count()
 
     def __init__(self, masterList=None):
         """Initialize a generic ObjectList."""
         self.itemList = []
         self.masterList = masterList
+        self.changed()
+
+    def changed(self):
+        """Mark the list as modified."""
+        self.version = next(ObjectList._versions)
 
     def __len__(self):
         return len(self.itemList)
@@ -303,16 +361,19 @@ class ObjectList:
 
     def __setitem__(self, key, value):
         self.itemList[key] = value
+        self.changed()
 
     def __delitem__(self, key):
         item = self.itemList[key]
         del self.itemList[key]
+        self.changed()
         if self.masterList is not None:
             self.masterList.remove(item)
 
     def remove(self, item):
         """Remove the passed item from the list."""
         self.itemList.remove(item)
+        self.changed()
         if self.masterList is not None:
             self.masterList.remove(item)
 
@@ -328,10 +389,13 @@ class ObjectList:
     def insert(self, i, x):
         """Standard list insert behaviour."""
         self.itemList.insert(i, x)
+        self.changed()
 
     def pop(self, i=None):
         """Standard list pop behaviour."""
-        return self.itemList.pop(i)
+        item = self.itemList.pop(i)
+        self.changed()
+        return item
 
     def index(self, i):
         """Standard list index behaviour."""
@@ -372,8 +436,10 @@ class DecisionMakerList(ObjectList):
         """
         if isinstance(item, DecisionMaker) and item not in self.itemList:
             self.itemList.append(item)
+            self.changed()
         elif isinstance(item, str):
             self.itemList.append(DecisionMaker(self.conflict, item))
+            self.changed()
 
     def __delitem__(self, key):
         self.itemList[key].onDelete()
@@ -424,6 +490,7 @@ class OptionList(ObjectList):
         """
         if isinstance(item, Option) and item not in self.itemList:
             self.itemList.append(item)
+            self.changed()
             if self.masterList is not None:
                 item.addRef()
                 if item not in self.masterList:
@@ -436,6 +503,7 @@ class OptionList(ObjectList):
                 self.masterList.append(newOption)
                 newOption.addRef()
             self.itemList.append(newOption)
+            self.changed()
 
     def from_json(self, optData):
         """Create a new option from JSON data and add it to the list."""
@@ -484,6 +552,7 @@ class ConditionList(ObjectList):
 
         if newCondition.name not in [cond.name for cond in self]:
             self.itemList.append(newCondition)
+            self.changed()
         else:
             print("attempted to add duplicate; ignored")
 
@@ -505,6 +574,21 @@ class ConditionList(ObjectList):
         for idx in toRemove[::-1]:
             del self[idx]
 
+    def compile(self):
+        """Return the compiled form of each condition in the list."""
+        return [cond.compile() for cond in self]
+
+    def test_many(self, codes):
+        """Test an array of decimal states against every condition.
+
+        Returns a boolean array with one row per state and one column per
+        condition.
+        """
+        result = numpy.zeros((len(codes), len(self)), bool)
+        for idx, cond in enumerate(self):
+            result[:, idx] = cond.test_many(codes)
+        return result
+
     def format(self, fmt="YN-"):
         """Return the conditions in the specified format.
 
@@ -523,48 +607,231 @@ class ConditionList(ObjectList):
             print('invalid format')
 
 
+class StateList:
+    """A read-only, sorted list of integer states backed by a NumPy array.
+
+    Behaves like the Python lists it replaces, but membership tests are O(1)
+    via a bitset (or O(log n) via binary search for very large values), and
+    index() uses binary search.
+    """
+
+    # Largest value for which a membership bitset is built (8 MB of bits).
+    bitsetLimit = 2**26
+
+    def __init__(self, values, dtype=numpy.int64):
+        """Wrap a sorted array of unique values."""
+        self.array = numpy.asarray(values, dtype)
+        self._bits = None
+        if len(self.array) and int(self.array[-1]) < self.bitsetLimit:
+            self._bits = numpy.zeros((int(self.array[-1]) >> 3) + 1,
+                                     numpy.uint8)
+            vals = self.array.astype(numpy.int64)
+            numpy.bitwise_or.at(self._bits, vals >> 3,
+                                (1 << (vals & 7)).astype(numpy.uint8))
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.array[key].tolist()
+        return int(self.array[key])
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __contains__(self, item):
+        try:
+            item = operator.index(item)
+        except TypeError:
+            return False
+        if self._bits is not None:
+            if 0 <= item < len(self._bits) << 3:
+                return bool(self._bits[item >> 3] >> (item & 7) & 1)
+            return False
+        return self.position(item) >= 0
+
+    def __eq__(self, other):
+        try:
+            return numpy.array_equal(self.array, numpy.asarray(other))
+        except (TypeError, ValueError):
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return 'StateList({})'.format(self.array.tolist())
+
+    def position(self, item):
+        """Position of item in the list, or -1 if it is not present."""
+        if item < 0 or not len(self.array):
+            return -1
+        idx = int(numpy.searchsorted(self.array, item))
+        if idx < len(self.array) and int(self.array[idx]) == item:
+            return idx
+        return -1
+
+    def positions(self, items):
+        """Vectorized position(): returns an array with -1 for misses."""
+        items = numpy.asarray(items, self.array.dtype)
+        idx = numpy.searchsorted(self.array, items)
+        idx[idx == len(self.array)] = 0
+        if not len(self.array):
+            return numpy.full(len(items), -1, numpy.int64)
+        return numpy.where(self.array[idx] == items, idx, -1)
+
+    def isin(self, items):
+        """Vectorized membership test for an array of items."""
+        return self.positions(items) >= 0
+
+    def index(self, item):
+        """Standard list index behaviour."""
+        idx = self.position(item)
+        if idx < 0:
+            raise ValueError("{} is not in list".format(item))
+        return idx
+
+    def tolist(self):
+        """Return the states as a list of Python ints."""
+        return self.array.tolist()
+
+
+class StateMap:
+    """A read-only dict-like mapping between two sorted lists of states.
+
+    Used to translate between decimal and ordered state numbers.
+    """
+
+    def __init__(self, keys, values):
+        """Map each item of StateList 'keys' to the matching item in values."""
+        self.keyList = keys
+        self.valueArray = numpy.asarray(values)
+
+    def __len__(self):
+        return len(self.keyList)
+
+    def __getitem__(self, key):
+        try:
+            idx = self.keyList.position(operator.index(key))
+        except TypeError:
+            idx = -1
+        if idx < 0:
+            raise KeyError(key)
+        return int(self.valueArray[idx])
+
+    def __contains__(self, key):
+        return key in self.keyList
+
+    def __iter__(self):
+        return iter(self.keyList)
+
+    def get(self, key, default=None):
+        """Standard dict get behaviour."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """Standard dict keys behaviour."""
+        return self.keyList.tolist()
+
+    def values(self):
+        """Standard dict values behaviour."""
+        return self.valueArray.tolist()
+
+    def items(self):
+        """Standard dict items behaviour."""
+        return zip(self.keys(), self.values())
+
+    def lookup(self, keys):
+        """Vectorized translation of an array of keys.
+
+        Raises KeyError if any of the keys are missing.
+        """
+        idx = self.keyList.positions(keys)
+        if (idx < 0).any():
+            raise KeyError(numpy.asarray(keys)[idx < 0][0])
+        return self.valueArray[idx]
+
+
 class FeasibleList:
-    """A list of feasible states, allowing access in multiple formats."""
+    """A list of feasible states, allowing access in multiple formats.
+
+    States are held as a sorted array of decimal codes ('codes'). The
+    decimal and ordered attributes are StateLists, and toOrdered/toDecimal
+    are StateMaps. The 'Y,N' strings and display notation are only
+    generated when first requested.
+    """
 
     def __init__(self, dash=None, toOrdered=None):
         """Construct a list of feasibles based on a dash format input list."""
+        self._yn = None
+        self._ordDec = None
         if not dash:
-            self.decimal = []
+            self.numOpts = 0
             self.dash = []
-            self.ordered = []
+            self._setStates(numpy.zeros(0, numpy.uint64),
+                            numpy.zeros(0, numpy.int64))
             return
+        self.numOpts = len(dash[0])
         # as 'Y,N,-' compact patterns
-        self.dash = gmcrUtil.reducePatterns(dash)
-
-        temp = sorted([(gmcrUtil.yn2dec(yn), yn) for yn
-                       in gmcrUtil.expandPatterns(self.dash)])
+        masks = gmcrUtil.reduceMasks([gmcrUtil.MaskPattern.fromYND(pat)
+                                      for pat in dash])
+        self.dash = [mask.ynd(self.numOpts) for mask in masks]
 
-        # as 'Y,N' patterns
-        self.yn = [yn for dec, yn in temp]
-
-        # as decimal values
-        self.decimal = [dec for dec, yn in temp]
+        codes = gmcrUtil.expandMasksToCodes(masks, self.numOpts)
 
-        # conversion dictionaries
+        # ordered numbers, either sequential or translated from a parent list
         if toOrdered is None:
-            self.toOrdered, self.toDecimal = gmcrUtil.orderedNumbers(
-                self.decimal)
+            ordered = numpy.arange(1, len(codes) + 1, dtype=numpy.int64)
+        elif isinstance(toOrdered, StateMap):
+            ordered = toOrdered.lookup(codes).astype(numpy.int64)
         else:
-            self.toOrdered = {x: toOrdered[x] for x in self.decimal}
-            self.toDecimal = {toOrdered[x]: x for x in self.decimal}
+            ordered = numpy.array([toOrdered[x] for x in codes.tolist()],
+                                  numpy.int64)
+        self._setStates(codes, ordered)
 
-        # as ordered numbers
-        self.ordered = sorted(self.toDecimal.keys())
+    def _setStates(self, codes, ordered):
+        """Build the lookup structures for the given codes."""
+        self.codes = codes
+
+        # as decimal values
+        self.decimal = StateList(codes, numpy.uint64)
 
-        # special display notation
-        self.ordDec = ['{:3d}  [{}]'.format(seq, dec)
-                       for seq, dec in zip(self.ordered, self.decimal)]
+        # as ordered numbers
+        self.ordered = StateList(ordered)
+
+        # conversion mappings
+        self.toOrdered = StateMap(self.decimal, ordered)
+        self.toDecimal = StateMap(self.ordered, codes)
+
+    @property
+    def yn(self):
+        """The feasible states as 'Y,N' patterns."""
+        if self._yn is None:
+            self._yn = gmcrUtil.codes2yn(self.codes, self.numOpts)
+        return self._yn
+
+    @property
+    def ordDec(self):
+        """The feasible states in special display notation."""
+        if self._ordDec is None:
+            self._ordDec = ['{:3d}  [{}]'.format(seq, dec)
+                            for seq, dec in zip(self.ordered, self.decimal)]
+        return self._ordDec
 
     def __len__(self):
-        return len(self.decimal)
+        return len(self.codes)
 
     def __iter__(self):
-        return iter(range(len(self.decimal)))
+        return iter(range(len(self.codes)))
 
 
 class Coalition:
@@ -697,8 +964,10 @@ class CoalitionList(ObjectList):
         """Add a Coalition or DecisionMaker to the list."""
         if isinstance(item, Coalition) and item not in self.itemList:
             self.itemList.append(item)
+            self.changed()
         elif isinstance(item, DecisionMaker):
             self.itemList.append(item)
+            self.changed()
         else:
             raise TypeError("{} is not a Coalition".format(item))
 
@@ -835,12 +1104,15 @@ class ConflictModel:
     def recalculateFeasibleStates(self, init_override=False):
         """Update all feasible state calculations."""
         oldFeas = list(self.feasibles.decimal)
-        feasDash = ['-' * len(self.options)]
+        numOpts = len(self.options)
+        feasMasks = [gmcrUtil.MaskPattern(0, 0)]
         for infeas in self.infeasibles:
-            res = gmcrUtil.rmvSt(feasDash, infeas.ynd())
-            feasDash = res[0]
+            res = gmcrUtil.rmvMask(feasMasks,
+                                   gmcrUtil.MaskPattern.fromYND(infeas.ynd()),
+                                   numOpts)
+            feasMasks = res[0]
             infeas.statesRemoved = res[1]
-        self.feasibles = FeasibleList(feasDash)
+        self.feasibles = FeasibleList([m.ynd(numOpts) for m in feasMasks])
         if self.feasibles.decimal != oldFeas:
             if not init_override:
                 self.onFeasibleStatesChanged()
@@ -5,6 +5,266 @@
 import numpy as np
 import itertools
 import json
+import math
+import statistics
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+# number of bits set in each possible byte value
+_POPCOUNT = np.array([bin(x).count('1') for x in range(256)], np.uint8)
+
+
+class BitMatrix:
+    """A boolean matrix stored as packed bits, one bit per element.
+
+    Rows are packed with np.packbits (little-endian bit order), so each row
+    of an n x m matrix takes ceil(m / 8) bytes. Supports element and row
+    lookups as well as element-wise AND/OR and row-wise any/popcount.
+    """
+
+    def __init__(self, bits, numCols):
+        """Wrap an array of packed rows holding numCols bits each."""
+        self.bits = np.asarray(bits, np.uint8)
+        self.numCols = numCols
+
+    @classmethod
+    def fromDense(cls, dense):
+        """Pack a 2D boolean array."""
+        dense = np.asarray(dense, bool)
+        return cls(np.packbits(dense, axis=1, bitorder='little'),
+                   dense.shape[1])
+
+    @property
+    def shape(self):
+        """(rows, columns) of the unpacked matrix."""
+        return (len(self.bits), self.numCols)
+
+    def __len__(self):
+        return len(self.bits)
+
+    def __getitem__(self, key):
+        """Look up elements by [row, column(s)], or a whole row by [row]."""
+        if not isinstance(key, tuple):
+            return self.row(key)
+        rowIdx, col = key
+        if isinstance(col, slice):
+            return self.row(rowIdx)[col]
+        col = np.asarray(col)
+        return (self.bits[rowIdx, col >> 3] >> (col & 7) & 1).astype(bool)
+
+    def row(self, rowIdx):
+        """Unpacked boolean array of one row."""
+        return np.unpackbits(self.bits[rowIdx], count=self.numCols,
+                             bitorder='little').astype(bool)
+
+    def indexes(self, rowIdx):
+        """Column indexes of the set bits in one row."""
+        return np.flatnonzero(self.row(rowIdx))
+
+    def __and__(self, other):
+        return BitMatrix(self.bits & other.bits, self.numCols)
+
+    def __or__(self, other):
+        return BitMatrix(self.bits | other.bits, self.numCols)
+
+    def any(self):
+        """Boolean array, True for rows with any bits set."""
+        return self.bits.any(axis=1)
+
+    def popcount(self):
+        """Number of bits set in each row."""
+        return _POPCOUNT[self.bits].sum(axis=1, dtype=np.int_)
+
+    def toDense(self, dtype=bool):
+        """Unpack to a full 2D array."""
+        return np.unpackbits(self.bits, axis=1, count=self.numCols,
+                             bitorder='little').astype(dtype)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.toDense(bool if dtype is None else dtype)
+
+    def tolist(self):
+        """The unpacked matrix as nested lists."""
+        return self.toDense().tolist()
+
+
+class PayoffDifferences:
+    """Change in payoff for a DM moving between pairs of states.
+
+    Element [state0, state1] is payoffs[state1] - payoffs[state0], calculated
+    on request so that no n x n matrix is stored.
+    """
+
+    def __init__(self, payoffs):
+        """Wrap an array of payoffs, indexed by state."""
+        self.payoffs = np.asarray(payoffs)
+
+    @property
+    def shape(self):
+        """(rows, columns) of the full matrix."""
+        return (len(self.payoffs), len(self.payoffs))
+
+    def __getitem__(self, key):
+        rows = self.payoffs[key[0]]
+        cols = self.payoffs[key[1]]
+        if np.ndim(rows) and np.ndim(cols):
+            return cols[np.newaxis, :] - rows[:, np.newaxis]
+        return cols - rows
+
+    def toDense(self):
+        """The full n x n matrix of payoff differences."""
+        return self.payoffs[np.newaxis, :] - self.payoffs[:, np.newaxis]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.toDense()
+        return self.toDense().astype(dtype)
+
+
+# source of data['version'] values in RMGenerator.dmData
+_dataVersions = itertools.count()
+
+
+def improvementBits(payoffs, blockSize=1024):
+    """BitMatrix of the moves that improve the payoff of every member.
+
+    payoffs is a list with an array of payoffs by state for each member of a
+    coalition (or a single DM). Element [state0, state1] is True if every
+    member has a higher payoff at state1 than at state0. Rows are compared
+    blockSize at a time, so scratch memory is limited to blockSize x n.
+    """
+    payoffs = [np.asarray(pay) for pay in payoffs]
+    numStates = len(payoffs[0])
+    bits = np.zeros((numStates, (numStates + 7) // 8), np.uint8)
+    for start in range(0, numStates, blockSize):
+        stop = min(start + blockSize, numStates)
+        block = np.ones((stop - start, numStates), bool)
+        for pay in payoffs:
+            block &= pay[np.newaxis, :] > pay[start:stop, np.newaxis]
+        bits[start:stop] = np.packbits(block, axis=1, bitorder='little')
+    return BitMatrix(bits, numStates)
+
+
+class AdjacencyLists:
+    """The states that each state connects to, in compressed sparse rows.
+
+    The targets of state i are indices[indptr[i]:indptr[i + 1]], in ascending
+    order. Lookups return views into indices, so nothing is copied.
+    """
+
+    def __init__(self, indptr, indices):
+        """Wrap CSR index arrays."""
+        self.indptr = np.asarray(indptr)
+        self.indices = np.asarray(indices)
+
+    @classmethod
+    def fromPairs(cls, rows, cols, numStates):
+        """Build from arrays of (row, col) pairs, sorted by row then col."""
+        indptr = np.zeros(numStates + 1, np.int64)
+        np.cumsum(np.bincount(rows, minlength=numStates), out=indptr[1:])
+        dtype = np.int32 if numStates < 2**31 else np.int64
+        return cls(indptr, np.asarray(cols, dtype))
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, stateIdx):
+        """Array of the states connected to stateIdx."""
+        return self.indices[self.indptr[stateIdx]:self.indptr[stateIdx + 1]]
+
+    def counts(self):
+        """Number of states connected to each state."""
+        return np.diff(self.indptr)
+
+    def rows(self):
+        """Source state of each entry in indices."""
+        return np.repeat(np.arange(len(self)), self.counts())
+
+    def select(self, keep):
+        """New AdjacencyLists with only the entries where keep is True."""
+        return AdjacencyLists.fromPairs(self.rows()[keep], self.indices[keep],
+                                        len(self))
+
+    def toDense(self, dtype=np.int_):
+        """Expand to a full n x n matrix."""
+        dense = np.zeros((len(self), len(self)), dtype)
+        dense[self.rows(), self.indices] = 1
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        return self.toDense(np.int_ if dtype is None else dtype)
+
+    def tolist(self):
+        """The dense matrix as nested lists."""
+        return self.toDense().tolist()
+
+
+class GroupReachability:
+    """Reachability for a single DM or coalition, stored in O(n) memory.
+
+    Without irreversible options or misperceptions, the states reachable by a
+    DM form disjoint groups (cliques) of states that agree on every option
+    controlled by the other DMs. Reachability is stored as a group id per
+    state, plus exceptions:
+    isolated: boolean array of states that can't be moved to or from.
+    irreversible: list of (taken, direction) pairs, where taken is a boolean
+        array of states in which the option is taken, and direction is "fwd"
+        (option can't be reversed once taken) or "back" (can't be taken).
+
+    The full matrix is only generated when requested with toDense().
+    """
+
+    def __init__(self, groups, isolated, irreversible=()):
+        """Store the group id of each state and the exceptions."""
+        self.groups = np.asarray(groups)
+        self.isolated = np.asarray(isolated, bool)
+        self.irreversible = list(irreversible)
+
+    def __len__(self):
+        return len(self.groups)
+
+    def toDense(self, dtype=np.int_):
+        """Expand to a full n x n reachability matrix."""
+        reach = ((self.groups[:, np.newaxis] == self.groups[np.newaxis, :]) &
+                 ~self.isolated[:, np.newaxis] & ~self.isolated[np.newaxis, :])
+        np.fill_diagonal(reach, False)
+        for taken, direction in self.irreversible:
+            if direction == "fwd":
+                reach[np.ix_(taken, ~taken)] = False
+            else:
+                reach[np.ix_(~taken, taken)] = False
+        return reach.astype(dtype)
+
+    def toAdjacency(self):
+        """Reachability as AdjacencyLists, built without any n x n matrix."""
+        numStates = len(self)
+        if not numStates:
+            return AdjacencyLists(np.zeros(1, np.int64), np.zeros(0, np.int32))
+        # state indexes sorted by group, and where each group starts
+        order = np.argsort(self.groups, kind='stable')
+        starts = np.zeros(int(self.groups.max()) + 2, np.int_)
+        starts[1:] = np.cumsum(np.bincount(self.groups))
+        # every pair of states in the same group, in row order
+        counts = np.diff(starts)[self.groups]
+        rows = np.repeat(np.arange(numStates), counts)
+        firsts = np.cumsum(counts) - counts
+        cols = order[np.arange(len(rows)) -
+                     np.repeat(firsts - starts[self.groups], counts)]
+        keep = (cols != rows) & ~self.isolated[rows] & ~self.isolated[cols]
+        for taken, direction in self.irreversible:
+            if direction == "fwd":
+                keep &= ~taken[rows] | taken[cols]
+            else:
+                keep &= taken[rows] | ~taken[cols]
+        return AdjacencyLists.fromPairs(rows[keep], cols[keep], numStates)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.toDense(np.int_ if dtype is None else dtype)
+
+    def tolist(self):
+        """The dense reachability matrix as nested lists."""
+        return self.toDense().tolist()
 
 
 class RMGenerator:
@@ -18,8 +278,13 @@ class RMGenerator:
     uis(dm, state)
 
     Other methods are provided that allow the reachability data to be exported.
+
+    improvementBlockSize is the number of rows of each improvement matrix
+    that are compared at once (see improvementBits).
     """
 
+    improvementBlockSize = 1024
+
     def __init__(self, conflict, useCoalitions=True):
         """Generate reachability matrices for conflict participants."""
         self.conflict = conflict
@@ -32,86 +297,111 @@ class RMGenerator:
         else:
             self.effectiveDMs = self.conflict.decisionMakers
 
+        self.conflict.options.set_indexes()
+        codes = conflict.feasibles.codes
+        irreversible = tuple((option.dec_val, option.permittedDirection)
+                             for option in conflict.options
+                             if option.permittedDirection in ("fwd", "back"))
+
         for dm in self.effectiveDMs:
-            dm.calculatePreferences()
-            dm.calculatePerceived()
+            # coalitions are built up from the cached data of their members
+            members = list(dm.members) if dm.isCoalition else [dm]
+            memberData = [self.dmData(member) for member in members]
 
-            dm.reachability = np.zeros((len(conflict.feasibles),
-                                        len(conflict.feasibles)),
-                                       np.int_)
+            # improvements[state0, state1] is True if dm prefers state1
             if dm.isCoalition:
-                pmTemp = np.array([dm.payoffs for dm in dm]).transpose()
-                pmTemp = pmTemp[np.newaxis, :, :] - pmTemp[:, np.newaxis]
-                dm.payoffMatrix = (pmTemp > 0).all(axis=2)
+                dm.improvements = BitMatrix(
+                    np.bitwise_and.reduce([data['improvements'].bits
+                                           for data in memberData]),
+                    len(codes))
+                dm.payoffMatrix = dm.improvements
             else:
-                pmTemp = np.array(dm.payoffs)
-                dm.payoffMatrix = pmTemp[np.newaxis, :] - pmTemp[:, np.newaxis]
-
-            # generate a flat list of move values controlled by other DMs
-
-            otherCOsMoves = [option.dec_val for otherDM in self.effectiveDMs
-                             if otherDM != dm for option in otherDM.options]
-            focalCOmoves = [option.dec_val for option in dm.options]
-
-            # translate the list of moves values for other DMs into a list of
-            # base states
-            fixedStates = [0]
-            for val in otherCOsMoves:
-                fixedStates = [y + z for y in fixedStates for z in [0, val]]
-
-            # translate the list of focal DM move values into a list of focal
-            # DM states
-            manipulatedStates = [0]
-            for val in focalCOmoves:
-                manipulatedStates = [y + z for y in manipulatedStates
-                                     for z in [0, val]]
-
-            # find the full set of mutually reachable states (controlled by the
-            # focal DM) for each fixed state (controlled by the other DMs)
-            for state in fixedStates:
-                reachable = [state]     # starting point
-                # full reachable set
-                reachable = [y + z for y in reachable
-                             for z in manipulatedStates]
-                # remove infeasibles
-                reachable = [y for y in reachable
-                             if (y in conflict.feasibles.decimal)]
-
-                # add one set of mutually reachable states
-                for state0 in reachable:
-                    s0 = self.conflict.feasibles.toOrdered[state0] - 1
-                    for state1 in reachable:
-                        s1 = self.conflict.feasibles.toOrdered[state1] - 1
-                        if s0 != s1:
-                            dm.reachability[s0, s1] = 1
-
-            # Remove irreversible states ######################################
-            for option in conflict.options:
-                if option.permittedDirection != "both":
-                    for idx0, state0yn in enumerate(conflict.feasibles.yn):
-                        # does state have potential for irreversible move?
-                        # value of the irreversible move option in DMs current
-                        # state (Y/N)
-                        val0 = state0yn[option.master_index]
-                        if (val0 == "Y") and (
-                           option.permittedDirection == "fwd") or (
-                           val0 == "N") and (
-                           option.permittedDirection == "back"):
-                            for idx1, state1yn in enumerate(
-                                    conflict.feasibles.yn):
-                                # is target move irreversible?
-                                val1 = state1yn[option.master_index]
-                                if val0 != val1:
-                                    # remove irreversible moves from
-                                    # reachability matrix
-                                    dm.reachability[idx0, idx1] = 0
-
-            # A DM may not move to or from a state they misperceive.
-            # Remove moves to or from misperceived states
-            for state in conflict.feasibles.ordered:
-                if state not in dm.perceived.ordered:
-                    dm.reachability[:, state - 1] = 0
-                    dm.reachability[state - 1, :] = 0
+                dm.improvements = memberData[0]['improvements']
+                dm.payoffMatrix = PayoffDifferences(dm.payoffs)
+
+            # bit masks of the options controlled by the focal DM and by the
+            # other DMs
+            focalMask = 0
+            for option in dm.options:
+                focalMask |= option.dec_val
+            otherMask = 0
+            for otherDM in self.effectiveDMs:
+                if otherDM != dm:
+                    for option in otherDM.options:
+                        otherMask |= option.dec_val
+            otherMask &= ~focalMask
+
+            # Reachability only depends on these masks and on the members'
+            # data, so it is reused while the DM stays in the same coalition.
+            movesKey = (tuple(id(member) for member in members),
+                        tuple(data['version'] for data in memberData),
+                        focalMask, otherMask, irreversible)
+            cached = memberData[0].get('moves')
+            if cached is None or cached[0] != movesKey:
+                cached = (movesKey,) + self._buildMoves(
+                    dm, codes, focalMask, otherMask, irreversible,
+                    np.logical_and.reduce([data['misperceived']
+                                           for data in memberData]))
+                memberData[0]['moves'] = cached
+            dm.reachability, dm.reachableMoves, dm.improvingMoves = cached[1:]
+
+    def dmData(self, dm):
+        """Cached per-DM data for an individual DecisionMaker.
+
+        Returns dm.solverData, a dict holding the DM's improvements
+        (BitMatrix) and misperceived states (boolean array). These are only
+        recalculated when the feasible states, the DM's payoffs or its
+        misperceptions change, which bumps data['version'].
+        """
+        dm.calculatePreferences()
+        codes = self.conflict.feasibles.codes
+        payoffs = np.asarray(dm.payoffs)
+        misperceptions = [misp.ynd() for misp in dm.misperceptions]
+        data = dm.solverData
+        if data is None or data['codes'] is not codes:
+            data = dm.solverData = {'codes': codes}
+        if data.get('misperceptions') != misperceptions:
+            dm.calculatePerceived()
+            data['misperceptions'] = misperceptions
+            data['misperceived'] = ~dm.perceived.decimal.isin(codes)
+            data['version'] = next(_dataVersions)
+        if ('payoffs' not in data or
+                not np.array_equal(data['payoffs'], payoffs)):
+            data['payoffs'] = payoffs.copy()
+            data['improvements'] = improvementBits([payoffs],
+                                                   self.improvementBlockSize)
+            data['version'] = next(_dataVersions)
+        return data
+
+    def _buildMoves(self, dm, codes, focalMask, otherMask, irreversible,
+                    misperceived):
+        """Reachability and move lists for dm.
+
+        Returns (GroupReachability, reachable moves, improving moves).
+        """
+        # states that agree on all options controlled by the other DMs
+        # form a group of mutually reachable states. States with options
+        # taken that no DM controls are unreachable.
+        uncontrolled = ((1 << len(self.conflict.options)) - 1 &
+                        ~(focalMask | otherMask))
+        groups = np.unique(codes & np.uint64(otherMask),
+                           return_inverse=True)[1].reshape(-1)
+        isolated = (codes & np.uint64(uncontrolled)) != 0
+
+        # A DM may not move to or from a state they misperceive.
+        isolated |= misperceived
+
+        # Irreversible moves are excluded when moves are looked up
+        irreversible = [((codes & np.uint64(decVal)) != 0, direction)
+                        for decVal, direction in irreversible]
+
+        reachability = GroupReachability(groups, isolated, irreversible)
+        # moves and unilateral improvements from each state, looked up
+        # by reachable() and UIs()
+        reachableMoves = reachability.toAdjacency()
+        improvingMoves = reachableMoves.select(
+            dm.improvements[reachableMoves.rows(), reachableMoves.indices])
+        return reachability, reachableMoves, improvingMoves
 
     def reachable(self, dm, stateIdx):
         """List all states reachable by a decisionMaker or coalition from state.
@@ -121,8 +411,7 @@ class RMGenerator:
         """
         if dm not in self.effectiveDMs:
             raise ValueError("DM or Coalition not valid.")
-        reachVec = np.nonzero(dm.reachability[stateIdx, :])[0].tolist()
-        return reachVec
+        return dm.reachableMoves[stateIdx].tolist()
 
     def UIs(self, dm, stateIdx, refState=None):
         """List unilateral improvements available to dm from state.
@@ -135,13 +424,21 @@ class RMGenerator:
             more preferred from refState.
         """
         if dm not in self.effectiveDMs:
-
             raise ValueError("DM or Coalition not valid.")
-        if refState is None:
-            refState = stateIdx
-        UIvec = np.nonzero(dm.reachability[stateIdx, :] *
-                           dm.payoffMatrix[refState, :] > 0)[0].tolist()
-        return UIvec
+        if refState is None or refState == stateIdx:
+            return dm.improvingMoves[stateIdx].tolist()
+        reachVec = dm.reachableMoves[stateIdx]
+        return reachVec[dm.improvements[refState, reachVec]].tolist()
+
+    def _moves(self, dm, stateIdx, uiOnly=False):
+        """States dm can move to from state, or only its UIs if uiOnly.
+
+        Used by the solvers in place of reachable() and UIs(), which copy
+        the states into a list. Returns a view that must not be modified.
+        """
+        if uiOnly:
+            return dm.improvingMoves[stateIdx]
+        return dm.reachableMoves[stateIdx]
 
     def saveJSON(self, file):
         """Export conflict data to JSON format for presentation.
@@ -179,11 +476,43 @@ class LogicalSolver(RMGenerator):
     """Solves the conflicts for equilibria.
 
     Uses logical definitions of stability concepts.
+
+    The states that opponents can reach from a move, which don't depend on
+    the focal DM's preferences, are memoized in sanctionCache (see
+    sequenceReach); sanctionCacheStats counts cache hits and misses.
     """
 
+    # the sanction cache is cleared once it holds this many states
+    sanctionCacheLimit = 1 << 22
+
+    # stability concepts, in the order of the rows of allEquilibria
+    conceptNames = ['Nash', 'GMR', 'SEQ', 'SIM', 'SEQ&SIM', 'SMR']
+    conceptKeys = {'nash': 'nash', 'gmr': 'gmr', 'seq': 'seq', 'sim': 'sim',
+                   'seq&sim': 'seqSim', 'seqsim': 'seqSim', 'smr': 'smr'}
+
     def __init__(self, conflict):
         """Create a logical solver."""
         RMGenerator.__init__(self, conflict)
+        self._initCaches()
+
+    def _initCaches(self):
+        """Create empty per-instance stability and sanction caches."""
+        self.stabilityCache = {}
+        self.clearSanctionCache()
+
+    def clearSanctionCache(self):
+        """Discard memoized sanction search results and reset statistics."""
+        self.sanctionCache = {}
+        self.sanctionCacheSize = 0
+        self.sanctionCacheStats = {'hits': 0, 'misses': 0}
+
+    def sanctionCacheHitRate(self):
+        """Fraction of sanction searches answered from the cache."""
+        total = (self.sanctionCacheStats['hits'] +
+                 self.sanctionCacheStats['misses'])
+        if total == 0:
+            return 0.0
+        return self.sanctionCacheStats['hits'] / total
 
     def chattyHelper(self, co, state):
         """Generate narration for verbose stability calculations."""
@@ -196,60 +525,173 @@ class LogicalSolver(RMGenerator):
         return snippet
 
     def checkSanctions(self, focalDM, otherDMs, state0, state1,
-                       uiOnly=False, countermove=False):
-        """Return (True, narration, sanctioned to) if move is sanctioned."""
+                       uiOnly=False, countermove=False, narrate=True):
+        """Return (True, narration, sanctioned to) if move is sanctioned.
+
+        If narrate is False, narration is None, and the states the other DMs
+        can reach from state1 come from sequenceReach and are tested against
+        focalDM's preferences all at once. The sanction found is the same as
+        from the depth first search used for narration.
+        """
+        if narrate:
+            return self._searchSanctions(focalDM, otherDMs, state0, state1,
+                                         uiOnly, countermove, narrate)
+        reach = self.sequenceReach(otherDMs, state1, uiOnly)
+        for state2 in reach[~self._improvesAt(focalDM, state0, reach)]:
+            if not (countermove and
+                    self.checkCountermoves(focalDM, state0, int(state2))):
+                return True, None, int(state2)
+        return False, None, None
+
+    def sequenceReach(self, otherDMs, state1, uiOnly=False):
+        """States reachable from state1 by moves of distinct otherDMs.
+
+        Returns an array of state indexes, in the order a depth first search
+        of the move sequences (as in _searchSanctions) first visits them. The
+        result is memoized on (state1, otherDMs, uiOnly), as it doesn't
+        depend on state0 or the focal DM. The cache is emptied rather than
+        grow past sanctionCacheLimit states.
+        """
+        key = (state1, frozenset(otherDMs), uiOnly)
+        reach = self.sanctionCache.get(key)
+        if reach is not None:
+            self.sanctionCacheStats['hits'] += 1
+            return reach
+        self.sanctionCacheStats['misses'] += 1
+        parts = []
         for dm in otherDMs:
-            if uiOnly:
-                moves = self.UIs(dm, state1)
-            else:
-                moves = self.reachable(dm, state1)
+            moves = self._moves(dm, state1, uiOnly)
+            oDMs = [d for d in otherDMs if d is not dm]
+            if not oDMs:
+                parts.append(moves)
+                continue
+            for state2 in moves:
+                parts.append([state2])
+                parts.append(self.sequenceReach(oDMs, state2, uiOnly))
+        reach = np.zeros(0, np.int_)
+        if parts:
+            order = np.concatenate(parts).astype(np.int_)
+            first = np.unique(order, return_index=True)[1]
+            reach = order[np.sort(first)]
+        if self.sanctionCacheSize + len(reach) > self.sanctionCacheLimit:
+            self.sanctionCache = {}
+            self.sanctionCacheSize = 0
+        if len(reach) <= self.sanctionCacheLimit:
+            self.sanctionCache[key] = reach
+            self.sanctionCacheSize += len(reach)
+        return reach
+
+    def _searchSanctions(self, focalDM, otherDMs, state0, state1, uiOnly,
+                         countermove, narrate):
+        """Depth first search for a sanction of the move state0 -> state1."""
+        for dm in otherDMs:
+            moves = self._moves(dm, state1, uiOnly)
 
             # if DM has no moves, pass.
-            if not moves:
+            if not len(moves):
                 continue
 
             for state2 in moves:
                 # check if state2 is an effective sanction
-                if focalDM.payoffMatrix[state0, state2] <= 0:
+                if not self.improves(focalDM, state0, state2):
                     # effective sanction found.
                     if countermove and self.checkCountermoves(focalDM, state0,
                                                               state2):
                         # countermoves allowed, and one exists.
                         pass
                     else:
-                        narration = "a move to {0} by {1}".format(
-                            self.chattyHelper(focalDM, state2), dm.name)
+                        narration = None
+                        if narrate:
+                            narration = "a move to {0} by {1}".format(
+                                self.chattyHelper(focalDM, state2), dm.name)
                         return True, narration, state2
                 # see if subsequent moves by other opponents can lead to
                 # an effective sanction.
                 oDMs = [d for d in otherDMs if d is not dm]
                 sanc, narr, s3 = self.checkSanctions(focalDM, oDMs, state0,
                                                      state2, uiOnly,
-                                                     countermove)
+                                                     countermove, narrate)
                 if sanc:
-                    narration = ("a move to state {0} by {1}, followed by "
-                                 "{2}").format(state2 + 1, dm.name, narr)
+                    narration = None
+                    if narrate:
+                        narration = ("a move to state {0} by {1}, followed by "
+                                     "{2}").format(state2 + 1, dm.name, narr)
                     return True, narration, s3
-        return False, "no sanctions", None
+        return False, "no sanctions" if narrate else None, None
+
+    def improves(self, dm, state0, state1):
+        """True if dm prefers state1 to state0.
+
+        For coalitions, every member must prefer state1.
+        """
+        return bool(dm.improvements[state0, state1])
+
+    def _improvesAt(self, dm, state0, states):
+        """Vectorized improves() over an array of state indexes."""
+        return dm.improvements[state0, states]
+
+    def simSanctions(self, dm, state0):
+        """Sorted decimal values of the feasible states that sanction dm.
+
+        These are the states that are not improvements on state0 for dm.
+        """
+        return self.conflict.feasibles.codes[
+            ~dm.improvements.row(state0)].tolist()
+
+    def simSanctionMask(self, dm, state0, decimals):
+        """Test an array of decimal values for states that sanction dm.
+
+        Returns a boolean array, True where the decimal value is a feasible
+        state that is not an improvement on state0 for dm.
+        """
+        positions = self.conflict.feasibles.decimal.positions(decimals)
+        result = positions >= 0
+        result[result] = ~dm.improvements[state0, positions[result]]
+        return result
+
+    def is_stable(self, state, concept, dm=None):
+        """Check the stability of a single state.
+
+        state is the index of the state, and concept is one of conceptNames.
+        If dm is given, returns True if state is stable for dm; otherwise
+        returns True if state is an equilibrium (stable for every DM).
+        Results are memoized.
+        """
+        try:
+            key = self.conceptKeys[concept.lower()]
+        except KeyError:
+            raise ValueError("Unknown stability concept: {}".format(concept))
+        if dm is None:
+            return all(self.is_stable(state, concept, d)
+                       for d in self.effectiveDMs)
+        cacheKey = (state, key, dm)
+        if cacheKey not in self.stabilityCache:
+            if key == 'seqSim':
+                result = (self.is_stable(state, 'SEQ', dm) or
+                          self.is_stable(state, 'SIM', dm))
+            else:
+                result = bool(getattr(self, key)(dm, state, narrate=False)[0])
+            self.stabilityCache[cacheKey] = result
+        return self.stabilityCache[cacheKey]
 
     def checkCountermoves(self, dm, state0, state2):
         """Check if DM can countermove after being sanctioned to state2."""
-        uis = self.UIs(dm, state2)
-        if not uis:
+        uis = self._moves(dm, state2, uiOnly=True)
+        if not len(uis):
             return False
-        for state3 in uis:
-            if dm.payoffMatrix[state0, state3] > 0:
-                # effective countermove found.
-                return True
-        return False
+        # an effective countermove is a UI that improves on state0
+        return bool(self._improvesAt(dm, state0, uis).any())
 
-    def nash(self, dm, state0):
+    def nash(self, dm, state0, narrate=True):
         """Calculate Nash stability.
 
-        Returns true if state0 Nash is stable for dm.
+        Returns true if state0 Nash is stable for dm, and the narration (None
+        if narrate is False).
         """
-        ui = self.UIs(dm, state0)
-        if not ui:
+        ui = self._moves(dm, state0, uiOnly=True)
+        if not narrate:
+            return not len(ui), None
+        if not len(ui):
             narr = ('{0} is Nash stable for DM {1} since they have no UIs from'
                     ' this state.\n').format(self.chattyHelper(dm, state0),
                                              dm.name)
@@ -263,262 +705,553 @@ class LogicalSolver(RMGenerator):
                                         for state1 in ui]))
             return False, narr
 
-    def seq(self, dm, state0):
-        """Calculate SEQ stability.
+    def _sanctionStability(self, dm, state0, name, narrate, uiOnly=False,
+                           countermove=False):
+        """Stability of state0 for dm where every UI must be sanctioned.
 
-        Returns True if state0 is SEQ stable for dm.
+        Shared by SEQ, GMR and SMR, which differ only in the sanctions allowed.
         """
-        ui = self.UIs(dm, state0)
-
-        if not ui:
-            narration = ("{0} is SEQ stable for DM {1} since they have no UIs "
-                         "from this state.\n").format(
-                self.chattyHelper(dm, state0), dm.name)
+        ui = self._moves(dm, state0, uiOnly=True)
+
+        if not len(ui):
+            narration = None
+            if narrate:
+                narration = ("{0} is {1} stable for DM {2} since they have no "
+                             "UIs from this state.\n").format(
+                    self.chattyHelper(dm, state0), name, dm.name)
             return True, narration
 
-        narration = ('From {0}, {1} has UIs available to: \n   {2}\nCheck '
-                     'for sanctioning...\n\n'
-                     ).format(self.chattyHelper(dm, state0), dm.name,
-                              ',\n   '.join([self.chattyHelper(dm, state1)
-                                             for state1 in ui]))
+        narration = None
+        if narrate:
+            narration = ('From {0}, {1} has UIs available to: \n   {2}\nCheck '
+                         'for sanctioning...\n\n'
+                         ).format(self.chattyHelper(dm, state0), dm.name,
+                                  ',\n   '.join([self.chattyHelper(dm, state1)
+                                                 for state1 in ui]))
         # for each potential move...
         for state1 in ui:
             oDMs = [d for d in self.effectiveDMs if d is not dm]
             sanc, narr, s3 = self.checkSanctions(dm, oDMs, state0, state1,
-                                                 uiOnly=True)
+                                                 uiOnly, countermove, narrate)
             if sanc:
-                narration += ("A move to {0} is sanctioned by {1}."
-                              "\n\n").format(self.chattyHelper(dm, state1),
-                                             narr)
+                if narrate:
+                    narration += ("A move to {0} is sanctioned by {1}.{2}"
+                                  "\n\n").format(
+                        self.chattyHelper(dm, state1), narr,
+                        " No effective countermove is possible."
+                        if countermove else "")
             else:
-                narration += ("{0} is unstable by SEQ for focal DM {1}, "
-                              "since other DMs cannot effectively sanction"
-                              " a move to {2}").format(
-                    self.chattyHelper(dm, state0), dm.name,
-                    self.chattyHelper(dm, state1))
+                if narrate:
+                    narration += ("{0} is unstable by {1} for focal DM {2}, "
+                                  "since other DMs cannot effectively "
+                                  "sanction a move to {3}").format(
+                        self.chattyHelper(dm, state0), name, dm.name,
+                        self.chattyHelper(dm, state1))
                 return False, narration
-        narration += ("{0} is stable by SEQ for focal DM {1}, since all "
-                      "available UIs are sanctioned by other"
-                      " players.\n\n").format(
-            self.chattyHelper(dm, state0), dm.name)
+        if narrate:
+            narration += ("{0} is stable by {1} for focal DM {2}, since all "
+                          "available UIs are sanctioned by other"
+                          " players.\n\n").format(
+                self.chattyHelper(dm, state0), name, dm.name)
         return True, narration
 
-    def sim(self, dm, state0):
-        """Calculate SIM stability.
+    def seq(self, dm, state0, narrate=True):
+        """Calculate SEQ stability.
 
-        Returns true if state0 is SIM stable for dm.
+        Returns True if state0 is SEQ stable for dm, and the narration (None
+        if narrate is False).
         """
-        ui = self.UIs(dm, state0)
+        return self._sanctionStability(dm, state0, 'SEQ', narrate,
+                                       uiOnly=True)
+
+    def sim(self, dm, state0, narrate=True):
+        """Calculate SIM stability.
 
-        if not ui:
-            narration = ("{0} is SIM stable since focal DM {1} has no UIs"
-                         " available.\n").format(self.chattyHelper(dm, state0),
-                                                 dm.name)
+        Returns true if state0 is SIM stable for dm, and the narration (None
+        if narrate is False).
+        """
+        ui = self._moves(dm, state0, uiOnly=True)
+
+        if not len(ui):
+            narration = None
+            if narrate:
+                narration = ("{0} is SIM stable since focal DM {1} has no UIs"
+                             " available.\n").format(
+                    self.chattyHelper(dm, state0), dm.name)
             return True, narration
 
-        narration = ('From {0}, {1} has UIs available to: \n   {2}\nCheck '
-                     'for sanctioning...\n\n'
-                     ).format(self.chattyHelper(dm, state0), dm.name,
-                              ',\n   '.join([self.chattyHelper(dm, state1)
-                                             for state1 in ui]))
+        narration = None
+        if narrate:
+            narration = ('From {0}, {1} has UIs available to: \n   {2}\nCheck '
+                         'for sanctioning...\n\n'
+                         ).format(self.chattyHelper(dm, state0), dm.name,
+                                  ',\n   '.join([self.chattyHelper(dm, state1)
+                                                 for state1 in ui]))
 
         dec = self.conflict.feasibles.decimal      # shorter handle
         s0dec = dec[state0]
-        # find all possible UIs available to other players
-        otherDMuis = [[0] + [dec[s2] - s0dec for s2 in self.UIs(oDM, state0)]
-                      for oDM in self.effectiveDMs if oDM != dm]
-        otherDMmovesets = itertools.product(*otherDMuis)
+        # changes in decimal value from every combination of simultaneous
+        # UIs (or no move) by the other players, built up one DM at a time.
+        offsets = {0}
+        for oDM in self.effectiveDMs:
+            if oDM != dm:
+                moves = [0] + [dec[s2] - s0dec
+                               for s2 in self._moves(oDM, state0, True)]
+                offsets = {a + b for a in offsets for b in moves}
+        offsets = sorted(offsets)
+        # decimal values of feasible states that would sanction dm
+        sanctions = self.simSanctions(dm, state0)
+        if sanctions is not None:
+            sanctionSet = set(sanctions)
+        offsetSet = set(offsets)
+        offsetArray = np.array(offsets, np.int64)
 
         for state1 in ui:
-            sanctioned = False
-            for moveset in otherDMmovesets:
-                state2combinedDec = dec[state1] + sum(moveset)
-                if state2combinedDec not in self.conflict.feasibles.decimal:
-                    # move combination would lead to an infeasible state
-                    # check next opponent moveset
-                    continue
+            s1dec = dec[state1]
+            # search whichever set is smaller for the lowest sanctioning
+            # final state
+            if sanctions is None:
+                finals = s1dec + offsetArray
+                finals = iter(finals[self.simSanctionMask(dm, state0, finals)]
+                              .tolist())
+            elif len(offsets) <= len(sanctions):
+                finals = (s1dec + off for off in offsets
+                          if s1dec + off in sanctionSet)
+            else:
+                finals = (fin for fin in sanctions if fin - s1dec in offsetSet)
+            state2combinedDec = next(finals, None)
+            if state2combinedDec is not None:
                 state2combined = dec.index(state2combinedDec)
-                if dm.payoffMatrix[state0, state2combined] <= 0:
-                    narration += ("Focal DM {0}'s attempt to move to {1} is "
-                                  "SIM sanctioned, due to simultaneous moves "
-                                  "by other DMs leading to a final state of "
-                                  "{2}.\nCheck other focal DM UIs for "
-                                  "sanctioning...\n\n").format(
-                                      dm.name, self.chattyHelper(dm, state1),
-                                      self.chattyHelper(dm, state2combined))
-                    sanctioned = True
-                    break
-            if sanctioned:
-                # A sanction against this UI was already found. check next UI.
+                if narrate:
+                    narration += (
+                        "Focal DM {0}'s attempt to move to {1} is SIM "
+                        "sanctioned, due to simultaneous moves by other "
+                        "DMs leading to a final state of {2}.\nCheck "
+                        "other focal DM UIs for sanctioning...\n\n"
+                    ).format(dm.name, self.chattyHelper(dm, state1),
+                             self.chattyHelper(dm, state2combined))
+                # A sanction against this UI was found. check next UI.
                 continue
             # gets here if none of the opponent movesets are sanctions.
-            narration += ("{0} is unstable by SIM for focal DM {1}, since no "
-                          "combination of simultaneous moves by other "
-                          "players can result in a sanction.\n\n").format(
-                              self.chattyHelper(dm, state0), dm.name)
+            if narrate:
+                narration += ("{0} is unstable by SIM for focal DM {1}, since "
+                              "no combination of simultaneous moves by other "
+                              "players can result in a sanction.\n\n"
+                              ).format(self.chattyHelper(dm, state0), dm.name)
             return False, narration
         # gets here if all UIs were sanctioned.
-        narration += ("{0} is stable by SIM for focal DM {1}, since all "
-                      "available UIs are sanctioned by simultaneous moves by "
-                      "other players.\n\n").format(
-                          self.chattyHelper(dm, state0), dm.name)
+        if narrate:
+            narration += ("{0} is stable by SIM for focal DM {1}, since all "
+                          "available UIs are sanctioned by simultaneous moves "
+                          "by other players.\n\n").format(
+                              self.chattyHelper(dm, state0), dm.name)
         return True, narration
 
-    def gmr(self, dm, state0):
+    def gmr(self, dm, state0, narrate=True):
         """Calculate GMR stability.
 
-        Returns True if state0 is GMR stable for dm.
+        Returns True if state0 is GMR stable for dm, and the narration (None
+        if narrate is False).
         """
-        ui = self.UIs(dm, state0)
+        return self._sanctionStability(dm, state0, 'GMR', narrate)
 
-        if not ui:
-            narration = ("{0} is GMR stable for DM {1} since they have no UIs "
-                         "from this state.\n").format(
-                self.chattyHelper(dm, state0), dm.name)
-            return True, narration
+    def smr(self, dm, state0, narrate=True):
+        """Calculate SMR stability.
 
-        narration = ('From {0}, {1} has UIs available to: \n   {2}\nCheck '
-                     'for sanctioning...\n\n'
-                     ).format(self.chattyHelper(dm, state0), dm.name,
-                              ',\n   '.join([self.chattyHelper(dm, state1)
-                                             for state1 in ui]))
-        # for each potential move...
-        for state1 in ui:
-            oDMs = [d for d in self.effectiveDMs if d is not dm]
-            sanc, narr, s3 = self.checkSanctions(dm, oDMs, state0, state1)
-            if sanc:
-                narration += ("A move to {0} is sanctioned by {1}."
-                              "\n\n").format(self.chattyHelper(dm, state1),
-                                             narr)
-            else:
-                narration += ("{0} is unstable by GMR for focal DM {1}, "
-                              "since other DMs cannot effectively sanction"
-                              " a move to {2}").format(
-                    self.chattyHelper(dm, state0), dm.name,
-                    self.chattyHelper(dm, state1))
-                return False, narration
-        narration += ("{0} is stable by GMR for focal DM {1}, since all "
-                      "available UIs are sanctioned by other"
-                      " players.\n\n").format(
-            self.chattyHelper(dm, state0), dm.name)
-        return True, narration
+        Returns True if state0 is SMR stable for dm, and the narration (None
+        if narrate is False).
+        """
+        return self._sanctionStability(dm, state0, 'SMR', narrate,
+                                       countermove=True)
 
-    def smr(self, dm, state0):
-        """Calculate SMR stability.
+    def explain(self, dm, state, concept):
+        """Narration of the stability of state for dm under concept.
 
-        Returns True if state0 is SMR stable for dm.
+        concept is one of 'Nash', 'GMR', 'SEQ', 'SIM' or 'SMR'.
         """
-        ui = self.UIs(dm, state0)
+        methods = {'nash': self.nash, 'gmr': self.gmr, 'seq': self.seq,
+                   'sim': self.sim, 'smr': self.smr}
+        try:
+            method = methods[concept.lower()]
+        except KeyError:
+            raise ValueError("Unknown stability concept: {}".format(concept))
+        return method(dm, state)[1]
 
-        if not ui:
-            narration = ("{0} is SMR stable for DM {1} since they have no UIs "
-                         "from this state.\n").format(
-                self.chattyHelper(dm, state0), dm.name)
-            return True, narration
+    def stabilities(self, concept, states=None, equilibriaOnly=False):
+        """Stability of states for every DM under one concept.
 
-        narration = ('From {0}, {1} has UIs available to: \n   {2}\nCheck '
-                     'for sanctioning...\n\n'
-                     ).format(self.chattyHelper(dm, state0), dm.name,
-                              ',\n   '.join([self.chattyHelper(dm, state1)
-                                             for state1 in ui]))
-        # for each potential move...
-        for state1 in ui:
-            oDMs = [d for d in self.effectiveDMs if d is not dm]
-            sanc, narr, s3 = self.checkSanctions(dm, oDMs, state0, state1,
-                                                 countermove=True)
-            if sanc:
-                narration += ("A move to {0} is sanctioned by {1}. No "
-                              "effective countermove is possible."
-                              "\n\n").format(self.chattyHelper(dm, state1),
-                                             narr)
+        Returns a DMs x states float array of 1 (stable) or 0 (unstable).
+        states defaults to all feasible states. If equilibriaOnly, a state is
+        not checked for any more DMs once one DM finds it unstable; entries
+        that were not checked are NaN.
+        """
+        if states is None:
+            states = range(len(self.conflict.feasibles))
+        method = getattr(self, concept)
+        result = np.full((len(self.effectiveDMs), len(states)),
+                         np.nan if equilibriaOnly else 0.0)
+        for col, state in enumerate(states):
+            for idx, dm in enumerate(self.effectiveDMs):
+                stable = method(dm, state, narrate=False)[0]
+                result[idx, col] = stable
+                if equilibriaOnly and not stable:
+                    break
+        return result
+
+    def parallelStabilities(self, concepts, workers, chunkSize=None,
+                            equilibriaOnly=False):
+        """Calculate stabilities for several concepts across a process pool.
+
+        Reachability and improvement data are placed in shared memory, which
+        the workers attach to instead of receiving a copy of the conflict.
+        Work is split into (concept, block of states) tasks.
+        Returns a dict of DMs x states arrays, as from stabilities().
+        """
+        numStates = len(self.conflict.feasibles)
+        if chunkSize is None:
+            chunkSize = max(1, -(-numStates // (4 * workers)))
+        blocks = []
+        spec = {'codes': _shareArray(self.conflict.feasibles.codes, blocks),
+                'dms': []}
+        for dm in self.effectiveDMs:
+            dmSpec = {'name': dm.name,
+                      'improvements': _shareArray(dm.improvements.bits, blocks)}
+            for moves in ['reachableMoves', 'improvingMoves']:
+                dmSpec[moves] = (
+                    _shareArray(getattr(dm, moves).indptr, blocks),
+                    _shareArray(getattr(dm, moves).indices, blocks))
+            spec['dms'].append(dmSpec)
+
+        tasks = [(concept, start, min(start + chunkSize, numStates),
+                  equilibriaOnly)
+                 for concept in concepts
+                 for start in range(0, numStates, chunkSize)]
+        results = {}
+        try:
+            with multiprocessing.Pool(workers, _initStabilityWorker,
+                                      (spec,)) as pool:
+                for (concept, start, stop, eqOnly), res in zip(
+                        tasks, pool.imap(_stabilityWorker, tasks)):
+                    if concept not in results:
+                        results[concept] = np.zeros(
+                            (len(self.effectiveDMs), numStates))
+                    results[concept][:, start:stop] = res
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        return results
+
+    def _seqSimEquilibria(self, stabilities, equilibriaOnly):
+        """States where every DM is stable by SEQ or by SIM.
+
+        Uses SEQ and SIM results already calculated where available.
+        """
+        numStates = len(self.conflict.feasibles)
+        seq = stabilities.get('seq')
+        sim = stabilities.get('sim')
+        if (not equilibriaOnly and seq is not None and sim is not None):
+            return (seq.astype(bool) | sim.astype(bool)).all(axis=0)
+
+        def known(stab, idx, state):
+            if stab is None or np.isnan(stab[idx, state]):
+                return None
+            return bool(stab[idx, state])
+
+        equilibria = np.ones(numStates, bool)
+        for state in range(numStates):
+            for idx, dm in enumerate(self.effectiveDMs):
+                stable = known(seq, idx, state)
+                if stable is None:
+                    stable = self.seq(dm, state, narrate=False)[0]
+                if not stable:
+                    stable = known(sim, idx, state)
+                    if stable is None:
+                        stable = self.sim(dm, state, narrate=False)[0]
+                if not stable:
+                    equilibria[state] = False
+                    break
+        return equilibria
+
+    def findEquilibria(self, workers=None, concepts=None,
+                       equilibriaOnly=False):
+        """Calculate equilibrium states for each stability concept.
+
+        concepts is a list of the concepts to calculate, from 'Nash', 'GMR',
+        'SEQ', 'SIM', 'SEQ&SIM' and 'SMR' (default all). allEquilibria has a
+        row for each concept calculated, in that order, and the attributes of
+        concepts that were not calculated are None. An empty list of concepts
+        raises ValueError.
+
+        If equilibriaOnly, a state stops being checked once any DM finds it
+        unstable, so stabilities of the remaining DMs are left as NaN.
+
+        If workers is greater than 1, the stability checks are shared
+        between that many processes. Results are identical either way.
+        """
+        self.clearSanctionCache()
+        if concepts is None:
+            concepts = self.conceptNames
+        requested = set()
+        for concept in concepts:
+            try:
+                requested.add(self.conceptKeys[concept.lower()])
+            except KeyError:
+                raise ValueError("Unknown stability concept: {}".format(
+                    concept))
+        if not requested:
+            raise ValueError("No stability concepts given")
+        self.equilibriumConcepts = [name for name in self.conceptNames
+                                    if self.conceptKeys[name.lower()]
+                                    in requested]
+        toCalc = [key for key in ['nash', 'seq', 'sim', 'gmr', 'smr']
+                  if key in requested]
+
+        if workers is not None and workers > 1:
+            stabilities = self.parallelStabilities(toCalc, workers,
+                                                   equilibriaOnly=equilibriaOnly)
+        else:
+            stabilities = {concept: self.stabilities(concept,
+                                                     equilibriaOnly=equilibriaOnly)
+                           for concept in toCalc}
+
+        rows = []
+        for name in self.conceptNames:
+            key = self.conceptKeys[name.lower()]
+            if key == 'seqSim':
+                equilibria = None
+                if key in requested:
+                    equilibria = self._seqSimEquilibria(stabilities,
+                                                        equilibriaOnly)
             else:
-                narration += ("{0} is unstable by SMR for focal DM {1}, "
-                              "since other DMs cannot effectively sanction"
-                              " a move to {2}").format(
-                    self.chattyHelper(dm, state0), dm.name,
-                    self.chattyHelper(dm, state1))
-                return False, narration
-        narration += ("{0} is stable by SMR for focal DM {1}, since all "
-                      "available UIs are sanctioned by other"
-                      " players.\n\n").format(
-            self.chattyHelper(dm, state0), dm.name)
-        return True, narration
+                stab = stabilities.get(key)
+                setattr(self, key + 'Stabilities', stab)
+                # a state is an equilibrium if it is stable for every DM
+                equilibria = None if stab is None else (stab == 1).all(axis=0)
+            setattr(self, key + 'Equilibria', equilibria)
+            if equilibria is not None:
+                rows.append(equilibria)
 
-    def findEquilibria(self):
-        """Calculate equilibrium states for each stability concept."""
-        # Nash calculation
-        nashStabilities = np.zeros((len(self.effectiveDMs),
-                                    len(self.conflict.feasibles)))
-        for idx, dm in enumerate(self.effectiveDMs):
-            for state in range(len(self.conflict.feasibles)):
-                nashStabilities[idx, state] = self.nash(dm, state)[0]
+        # output
+        self.allEquilibria = np.vstack(rows)
 
-        self.nashStabilities = np.copy(nashStabilities)
 
-        np.invert(nashStabilities.astype('bool'), nashStabilities)
-        self.nashEquilibria = np.invert(sum(nashStabilities, 0).astype('bool'))
+def _shareArray(array, blocks):
+    """Copy array into a new shared memory block, appended to blocks.
 
-        # SEQ calculation
-        seqStabilities = np.zeros((len(self.effectiveDMs),
-                                   len(self.conflict.feasibles)))
-        for idx, dm in enumerate(self.effectiveDMs):
-            for state in range(len(self.conflict.feasibles)):
-                seqStabilities[idx, state] = self.seq(dm, state)[0]
+    Returns (block name, shape, dtype) for attaching with _attachArray.
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True,
+                                       size=max(1, array.nbytes))
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    blocks.append(block)
+    return (block.name, array.shape, array.dtype.str)
 
-        self.seqStabilities = np.copy(seqStabilities)
 
-        np.invert(seqStabilities.astype('bool'), seqStabilities)
-        self.seqEquilibria = np.invert(sum(seqStabilities, 0).astype('bool'))
+def _attachArray(spec, blocks):
+    """Read-only view of an array shared by _shareArray."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+    array = np.ndarray(shape, dtype, buffer=block.buf)
+    array.flags.writeable = False
+    return array
 
-        # SIM calculation
-        simStabilities = np.zeros((len(self.effectiveDMs),
-                                   len(self.conflict.feasibles)))
-        for idx, dm in enumerate(self.effectiveDMs):
-            for state in range(len(self.conflict.feasibles)):
-                simStabilities[idx, state] = self.sim(dm, state)[0]
 
-        self.simStabilities = np.copy(simStabilities)
+class _WorkerDM:
+    """Stand-in for a DM or coalition inside a stability worker process."""
 
-        np.invert(simStabilities.astype('bool'), simStabilities)
-        self.simEquilibria = np.invert(sum(simStabilities, 0).astype('bool'))
+    isCoalition = False
 
-        # SEQ + SIM calculation
-        seqSimStabilities = np.bitwise_and(simStabilities.astype('bool'),
-                                           seqStabilities.astype('bool'))
-        self.seqSimEquilibria = np.invert(sum(seqSimStabilities,
-                                              0).astype('bool'))
+    def __init__(self, name, reachableMoves, improvingMoves, improvements):
+        self.name = name
+        self.reachableMoves = reachableMoves
+        self.improvingMoves = improvingMoves
+        self.improvements = improvements
 
-        # GMR calculation
-        gmrStabilities = np.zeros((len(self.effectiveDMs),
-                                   len(self.conflict.feasibles)))
-        for idx, dm in enumerate(self.effectiveDMs):
-            for state in range(len(self.conflict.feasibles)):
-                gmrStabilities[idx, state] = self.gmr(dm, state)[0]
 
-        self.gmrStabilities = np.copy(gmrStabilities)
+_worker = {}
 
-        np.invert(gmrStabilities.astype('bool'), gmrStabilities)
-        self.gmrEquilibria = np.invert(sum(gmrStabilities, 0).astype('bool'))
 
-        # SMR calculations
-        smrStabilities = np.zeros((len(self.effectiveDMs),
-                                   len(self.conflict.feasibles)))
-        for idx, dm in enumerate(self.effectiveDMs):
-            for state in range(len(self.conflict.feasibles)):
-                smrStabilities[idx, state] = self.smr(dm, state)[0]
+def _initStabilityWorker(spec):
+    """Build a LogicalSolver in a worker process from shared arrays."""
+    from data_01_conflictModel import StateList
+    blocks = []
+    codes = _attachArray(spec['codes'], blocks)
+    numStates = len(codes)
+    dms = []
+    for dmSpec in spec['dms']:
+        moves = [AdjacencyLists(*[_attachArray(array, blocks)
+                                  for array in dmSpec[key]])
+                 for key in ['reachableMoves', 'improvingMoves']]
+        improvements = BitMatrix(_attachArray(dmSpec['improvements'], blocks),
+                                 numStates)
+        dms.append(_WorkerDM(dmSpec['name'], *moves, improvements))
 
-        self.smrStabilities = np.copy(smrStabilities)
+    solver = LogicalSolver.__new__(LogicalSolver)
+    solver.conflict = _WorkerConflict(codes, StateList(codes, np.uint64))
+    solver.effectiveDMs = dms
+    solver._initCaches()
+    _worker['solver'] = solver
+    _worker['blocks'] = blocks
 
-        np.invert(smrStabilities.astype('bool'), smrStabilities)
-        self.smrEquilibria = np.invert(sum(smrStabilities, 0).astype('bool'))
 
-        # output
-        self.allEquilibria = np.vstack((self.nashEquilibria,
-                                        self.gmrEquilibria,
-                                        self.seqEquilibria,
-                                        self.simEquilibria,
-                                        self.seqSimEquilibria,
-                                        self.smrEquilibria))
+class _WorkerConflict:
+    """The parts of a conflict that LogicalSolver needs without narration."""
+
+    def __init__(self, codes, decimal):
+        self.feasibles = self
+        self.codes = codes
+        self.decimal = decimal
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def _stabilityWorker(task):
+    """Stabilities of a block of states for one concept."""
+    concept, start, stop, equilibriaOnly = task
+    return _worker['solver'].stabilities(concept, range(start, stop),
+                                         equilibriaOnly)
+
+
+def setPartitions(items):
+    """Generate every partition of items into non-empty groups.
+
+    Each partition is a list of groups (lists), in order of the first item of
+    each group. Partitions are generated from everything in one group to
+    every item in a group of its own.
+    """
+    items = list(items)
+
+    def extend(labels, numGroups):
+        if len(labels) == len(items):
+            groups = [[] for idx in range(numGroups)]
+            for item, label in zip(items, labels):
+                groups[label].append(item)
+            yield groups
+            return
+        for label in range(numGroups + 1):
+            yield from extend(labels + [label], max(numGroups, label + 1))
+
+    yield from extend([], 0)
+
+
+class CoalitionStructures:
+    """Equilibria of a conflict under several coalition structures.
+
+    partitions: list of coalition structures, each a list of groups of DM
+        indexes.
+    concepts: names of the stability concepts solved for.
+    states: ordered numbers of the feasible states.
+    equilibria: boolean array of partitions x concepts x states.
+    """
+
+    def __init__(self, partitions, concepts, states, equilibria):
+        """Collect the results of solveCoalitionStructures."""
+        self.partitions = partitions
+        self.concepts = concepts
+        self.states = np.asarray(states)
+        self.equilibria = np.asarray(equilibria, bool)
+
+    def __len__(self):
+        return len(self.partitions)
+
+    def label(self, idx):
+        """Coalition structure in the GUI's notation, e.g. '[1, 2], 3'."""
+        rep = [group[0] + 1 if len(group) == 1 else
+               [dmIdx + 1 for dmIdx in group]
+               for group in self.partitions[idx]]
+        return str(rep)[1:-1]
+
+    def rows(self):
+        """For each partition, a dict of concept: ordered equilibrium states."""
+        return [{concept: self.states[eq].tolist()
+                 for concept, eq in zip(self.concepts, equilibria)}
+                for equilibria in self.equilibria]
+
+    def format(self):
+        """The equilibria of each partition as a text table."""
+        table = [['Coalitions'] + list(self.concepts)]
+        for idx, row in enumerate(self.rows()):
+            table.append([self.label(idx)] +
+                         [', '.join(str(st) for st in row[concept]) or '-'
+                          for concept in self.concepts])
+        widths = [max(len(line[col]) for line in table)
+                  for col in range(len(table[0]))]
+        return '\n'.join(' | '.join(cell.ljust(width)
+                                    for cell, width in zip(line, widths))
+                         .rstrip() for line in table)
+
+
+def _solvePartition(conflict, partition, concepts):
+    """Set the conflict's coalitions to partition and find equilibria.
+
+    Returns (concept names, allEquilibria).
+    """
+    conflict.coalitions.itemList = []
+    for group in partition:
+        dms = [conflict.decisionMakers[dmIdx] for dmIdx in group]
+        if len(dms) == 1:
+            conflict.coalitions.append(dms[0])
+        else:
+            conflict.coalitions.append(conflict.newCoalition(dms))
+    solver = LogicalSolver(conflict)
+    solver.findEquilibria(concepts=concepts)
+    return solver.equilibriumConcepts, solver.allEquilibria.astype(bool)
+
+
+def _initPartitionWorker(conflictRep):
+    """Rebuild the conflict in a worker process from its JSON form."""
+    from data_01_conflictModel import ConflictModel
+    conflict = ConflictModel()
+    conflict.json_import(conflictRep)
+    _worker['conflict'] = conflict
+
+
+def _partitionWorker(task):
+    """Equilibria of one coalition structure."""
+    partition, concepts = task
+    return _solvePartition(_worker['conflict'], partition, concepts)
+
+
+def solveCoalitionStructures(conflict, workers=None, concepts=None,
+                             partitions=None):
+    """Find equilibria for every coalition structure of a conflict.
+
+    partitions is a list of coalition structures to solve, each a list of
+    groups of DM indexes; by default every set partition of the DMs.
+    concepts is as for LogicalSolver.findEquilibria.
+
+    If workers is greater than 1, structures are solved in that many
+    processes, each of which rebuilds the conflict once. Per-DM data is
+    cached on the DMs (see RMGenerator.dmData), so it is reused from one
+    structure to the next. The conflict's own coalitions are left unchanged.
+    Returns a CoalitionStructures table.
+    """
+    if partitions is None:
+        partitions = list(setPartitions(range(len(conflict.decisionMakers))))
+    tasks = [(partition, concepts) for partition in partitions]
+
+    if workers is not None and workers > 1:
+        conflictRep = json.loads(json.dumps(conflict.export_rep()))
+        with multiprocessing.Pool(workers, _initPartitionWorker,
+                                  (conflictRep,)) as pool:
+            results = pool.map(_partitionWorker, tasks)
+    else:
+        original = list(conflict.coalitions.itemList)
+        try:
+            results = [_solvePartition(conflict, partition, concepts)
+                       for partition in partitions]
+        finally:
+            conflict.coalitions.itemList = original
+            conflict.coalitions.changed()
+
+    conceptNames = results[0][0] if results else []
+    return CoalitionStructures(partitions, conceptNames,
+                               conflict.feasibles.ordered,
+                               [equilibria for names, equilibria in results])
 
 
 class InverseSolver(RMGenerator):
@@ -577,6 +1310,49 @@ class InverseSolver(RMGenerator):
         for y in c:
             yield y
 
+    def _shardPrefix(self, numShards):
+        """Number of leading DMs whose rankings are split between shards.
+
+        Enough DMs are taken for at least numShards combinations of their
+        rankings, if there are that many.
+        """
+        combinations = 1
+        for numPrefix, (start, end) in enumerate(self._spans()):
+            if combinations >= numShards:
+                return numPrefix, combinations
+            combinations *= math.factorial(max(end - start, 0))
+        return len(self._spans()), combinations
+
+    def shardRankings(self, numPrefix, start, stop):
+        """Generate a contiguous part of the rankings from prefPermGen.
+
+        Each combination of the first numPrefix DMs' rankings is followed in
+        prefPermGen by every ranking of the other DMs. This generates those
+        for the start-th up to the (stop - 1)-th combinations, in the same
+        order as prefPermGen.
+        """
+        fulls = [list(dm.preferenceRanking)
+                 for dm in self.conflict.decisionMakers]
+        spans = self._spans()
+        for index in range(start, stop):
+            prefix = []
+            for full, (first, end) in reversed(list(zip(fulls[:numPrefix],
+                                                        spans[:numPrefix]))):
+                size = max(end - first, 0)
+                index, permIdx = divmod(index, math.factorial(size))
+                # the permIdx-th permutation of the span, as ordered by
+                # itertools.permutations
+                elements = full[first:end]
+                perm = []
+                for place in range(size, 0, -1):
+                    pick, permIdx = divmod(permIdx, math.factorial(place - 1))
+                    perm.append(elements.pop(pick))
+                prefix.insert(0, full[:first] + perm + full[max(end, first):])
+            rest = [self._decPerm(full, span) for full, span in
+                    zip(fulls[numPrefix:], spans[numPrefix:])]
+            for ranking in itertools.product(*rest):
+                yield tuple(prefix) + ranking
+
     def nashCond(self):
         """Generates a list of the conditions that preferences must satisfy for
         Nash stability to exist.
@@ -776,110 +1552,488 @@ class InverseSolver(RMGenerator):
             for z, idx in enumerate(dm):    # idx contains a list of
                 self.mustBeLowerSMR[y][z] = [self.reachable(self.conflict.decisionMakers[y], state2) for state2 in idx]
 
-    def findEquilibria(self):
-        """Generate a list of all requested preference rankings, then checks if they meet equilibrium requirements."""
+        # The same lists flattened into index arrays for _checkRankings.
+        # Moves from desEq are listed in 'nash'. The sanctions available
+        # after each move are consecutive runs of 'gmr', starting at
+        # 'gmrStarts'; 'mover' is the opponent making each sanction, and
+        # 'from' is the state it is made from. Countermoves from each
+        # sanction are runs of 'smr', starting at 'smrStarts'.
+        self.mblArrays = []
+        for y, dm in enumerate(self.mustBeLowerNash):
+            mbl = {'nash': np.array(dm, np.int_), 'gmr': [], 'mover': [],
+                   'from': [], 'smr': [], 'gmrStarts': [0], 'smrStarts': [0]}
+            for z, state1 in enumerate(dm):
+                for dm2 in range(len(self.conflict.decisionMakers)):
+                    if y != dm2:
+                        reach = self.reachable(
+                            self.conflict.decisionMakers[dm2], state1)
+                        mbl['gmr'] += reach
+                        mbl['mover'] += [dm2] * len(reach)
+                        mbl['from'] += [state1] * len(reach)
+                mbl['gmrStarts'].append(len(mbl['gmr']))
+                for counter in self.mustBeLowerSMR[y][z]:
+                    mbl['smr'] += counter
+                    mbl['smrStarts'].append(len(mbl['smr']))
+            self.mblArrays.append({key: np.array(value, np.int_)
+                                   for key, value in mbl.items()})
+
+    def _payoffArray(self, rankings):
+        """Payoffs implied by a list of preference rankings.
+
+        Returns an array of rankings x DMs x states. Higher is better.
+        """
+        numStates = len(self.conflict.feasibles)
+        payoffs = np.zeros((len(rankings), len(self.conflict.decisionMakers),
+                            numStates), np.int_)
+        # rankings generated by prefPermGen share the ranking lists of each
+        # DM, so each distinct list is only converted once
+        converted = {}
+        for prefsIdx, prefsX in enumerate(rankings):
+            for dm, ranking in enumerate(prefsX):
+                if id(ranking) not in converted:
+                    states = []
+                    values = []
+                    for i, y in enumerate(ranking):
+                        group = y if isinstance(y, list) else [y]
+                        states.extend(group)
+                        values.extend([numStates - i] * len(group))
+                    pay = np.zeros(numStates, np.int_)
+                    pay[np.array(states, np.int_) - 1] = values
+                    converted[id(ranking)] = (ranking, pay)
+                payoffs[prefsIdx, dm] = converted[id(ranking)][1]
+        return payoffs
+
+    def _checkRankings(self, rankings):
+        """Check a list of preference rankings for stability at desEq.
+
+        Returns (nash, gmr, seq, smr), each a boolean array of rankings x
+        DMs. All rankings are checked at once, against the index arrays
+        built by _mblInit.
+        """
+        payoffs = self._payoffArray(rankings)
+        numDMs = len(self.conflict.decisionMakers)
+        rows = np.arange(len(rankings))
+        nash = np.ones((len(rankings), numDMs), bool)
+        gmr = np.ones((len(rankings), numDMs), bool)
+        seq = np.ones((len(rankings), numDMs), bool)
+        smr = np.ones((len(rankings), numDMs), bool)
+
+        for dm, mbl in enumerate(self.mblArrays):
+            if not len(mbl['nash']):
+                continue
+            pay = payoffs[:, dm]
+            pay0 = pay[:, self.desEq][:, np.newaxis]
+            ui = pay[:, mbl['nash']] > pay0
+            nash[:, dm] = ~ui.any(axis=1)
+            # Only the last UI in mustBeLowerNash order decides the result
+            # for GMR, SEQ and SMR.
+            lastUI = ui.shape[1] - 1 - ui[:, ::-1].argmax(axis=1)
+
+            starts = mbl['gmrStarts']
+            sanctions = pay[:, mbl['gmr']] < pay0
+            gmrOK = _segmentAny(sanctions, starts)[rows, lastUI]
+            gmr[:, dm] = nash[:, dm] | gmrOK
+
+            # for SEQ, the opponent's move must also be a UI for them
+            moverUI = (payoffs[:, mbl['mover'], mbl['gmr']] >
+                       payoffs[:, mbl['mover'], mbl['from']])
+            seq[:, dm] = nash[:, dm] | _segmentAny(sanctions & moverUI,
+                                                   starts)[rows, lastUI]
+
+            # for SMR, the first sanction must leave the DM no countermove
+            # back above desEq
+            counter = _segmentAny(pay[:, mbl['smr']] > pay0, mbl['smrStarts'])
+            counter = np.hstack((counter, np.zeros((len(rankings), 1), bool)))
+            first = _segmentFirst(sanctions, starts)[rows, lastUI]
+            smr[:, dm] = nash[:, dm] | (gmrOK & ~counter[rows, first])
+
+        return nash, gmr, seq, smr
+
+    def iterEquilibria(self, chunkSize=1000, search=None, shard=None):
+        """Check every requested preference ranking, chunkSize at a time.
+
+        Rankings are generated lazily by prefPermGen, or by
+        validRankings(search) if a concept is given for search, or only
+        those from shardRankings(*shard) if shard is given. Yields
+        (rankings, nash, gmr, seq, smr) for each chunk, as from
+        _checkRankings.
+        """
         self._mblInit()
-        self.preferenceRankings = list(self.prefPermGen([dm.preferenceRanking for dm in self.conflict.decisionMakers], self.vary))
-        self.nash = np.ones((len(self.preferenceRankings), len(self.conflict.decisionMakers))).astype('bool')
-        self.gmr = np.zeros((len(self.preferenceRankings), len(self.conflict.decisionMakers))).astype('bool')
-        self.seq = np.zeros((len(self.preferenceRankings), len(self.conflict.decisionMakers))).astype('bool')
-        self.smr = np.zeros((len(self.preferenceRankings), len(self.conflict.decisionMakers))).astype('bool')
-
-        for prefsIdx, prefsX in enumerate(self.preferenceRankings):
-            payoffs = [[0] * len(self.conflict.feasibles) for x in range(len(self.conflict.decisionMakers))]
-
-            for dm in range(len(self.conflict.decisionMakers)):
-                for i, y in enumerate(prefsX[dm]):
-                    try:
-                        for z in y:
-                            payoffs[dm][z - 1] = len(self.conflict.feasibles) - i
-                    except TypeError:
-                        payoffs[dm][y - 1] = len(self.conflict.feasibles) - i
-            # check if Nash
-            for dm in range(len(self.conflict.decisionMakers)):
-                if not self.nash[prefsIdx, dm]:
-                    break
-                # payoff of the original state; higher is better
-                pay0 = payoffs[dm][self.desEq]
-                for pay1 in (payoffs[dm][state1] for state1 in self.mustBeLowerNash[dm]):    # get preferences of all states reachable by 'dm'
-                    if pay0 < pay1:       # prefs0>prefs1 means a UI exists
-                        self.nash[prefsIdx, dm] = False
-                        break
-
-            # check if GMR
-            self.gmr[prefsIdx, :] = self.nash[prefsIdx, :]
-
-            for dm in range(len(self.conflict.decisionMakers)):
-                if self.nash[prefsIdx, dm]:
-                    continue
-                pay0 = payoffs[dm][self.desEq]
-                for state1p, state1d in enumerate(self.mustBeLowerNash[dm]):
-                    pay1 = payoffs[dm][state1d]
-                    if pay0 < pay1:   # if there is a UI available
-                        # nash=False
-                        self.gmr[prefsIdx, dm] = False
-                        for pay2 in (payoffs[dm][state2] for state2 in self.mustBeLowerGMR[dm][state1p]):
-                            if pay0 > pay2:       # if initial state was preferred to sanctioned state
-                                self.gmr[prefsIdx, dm] = True
-                                break
-
-            # check if SEQ
-            mustBeLowerSEQ = [[[] for state1 in dm] for dm in self.mustBeLowerNash]
-
-            for y, dm in enumerate(self.mustBeLowerNash):
-                for z, state1 in enumerate(dm):
-                    for dm2 in range(len(self.conflict.decisionMakers)):
-                        if y != dm2:
-                            mustBeLowerSEQ[y][z] += [state2 for state2 in self.reachable(self.conflict.decisionMakers[dm2], state1) if payoffs[dm2][state2] > payoffs[dm2][state1]]
-
-            self.seq[prefsIdx, :] = self.nash[prefsIdx, :]
-
-            for dm in range(len(self.conflict.decisionMakers)):
-                if self.nash[prefsIdx, dm]:
-                    continue
-                pay0 = payoffs[dm][self.desEq]
-                for state1p, state1d in enumerate(self.mustBeLowerNash[dm]):
-                    pay1 = payoffs[dm][state1d]
-                    if pay0 < pay1:  # if there is a UI available
-                        # nash=False
-                        self.seq[prefsIdx, dm] = False
-                        for pay2 in (payoffs[dm][state2] for state2 in mustBeLowerSEQ[dm][state1p]):
-                            if pay0 > pay2:       # if initial state was preferred to sanctioned state
-                                self.seq[prefsIdx, dm] = True        # set to true since sanctioned, however this will be broken if another UI exists.
-                                break
-
-            # check if SMR
-            self.smr[prefsIdx, :] = self.nash[prefsIdx, :]
-
-            for dm in range(len(self.conflict.decisionMakers)):
-                if self.nash[prefsIdx, dm]:
-                    continue
-                pay0 = payoffs[dm][self.desEq]
-                for state1p, state1d in enumerate(self.mustBeLowerNash[dm]):
-                    pay1 = payoffs[dm][state1d]
-                    if pay0 < pay1:   # if there is a UI available
-                        # nash=False
-                        self.smr[prefsIdx, dm] = False
-                        for state2p, state2d in enumerate(self.mustBeLowerGMR[dm][state1p]):
-                            pay2 = payoffs[dm][state2d]
-                            if pay0 > pay2:       # if initial state was preferred to sanctioned state
-                                self.smr[prefsIdx, dm] = True        # set to true since sanctioned, however this will be broken if another UI exists, or if dm can countermove.
-                                for pay3 in (payoffs[dm][state3] for state3 in self.mustBeLowerSMR[dm][state1p][state2p]):
-                                    if pay0 < pay3:       # if countermove is better than original state.
-                                        self.smr[prefsIdx, dm] = False
-                                        break
-                                break       # check this
-
-        self.equilibriums = np.vstack((self.nash.all(axis=1), self.seq.all(axis=1), self.gmr.all(axis=1), self.smr.all(axis=1)))
+        if search is not None:
+            perms = self.validRankings(search, chunkSize)
+        elif shard is not None:
+            perms = self.shardRankings(*shard)
+        else:
+            perms = self.prefPermGen([dm.preferenceRanking
+                                      for dm in self.conflict.decisionMakers],
+                                     self.vary)
+        while True:
+            rankings = list(itertools.islice(perms, chunkSize))
+            if not rankings:
+                return
+            yield (rankings,) + self._checkRankings(rankings)
+
+    def _stableAbove(self, dm, concept, above, equal):
+        """Check if desEq is stable for dm given how dm ranks it.
+
+        above is the set of states dm prefers to desEq, and equal the states
+        ranked equally with it. Follows the same rules as _checkRankings, for
+        'nash', 'gmr' or 'smr'.
+        """
+        uis = [z for z, state1 in enumerate(self.mustBeLowerNash[dm])
+               if state1 in above]
+        if not uis:
+            return True
+        if concept == 'nash':
+            return False
+        last = uis[-1]
+        sanctions = [k for k, state2 in enumerate(self.mustBeLowerGMR[dm][last])
+                     if state2 not in above and state2 not in equal]
+        if concept == 'gmr' or not sanctions:
+            return bool(sanctions)
+        counters = self.mustBeLowerSMR[dm][last][sanctions[0]]
+        return not any(state3 in above for state3 in counters)
+
+    def _dmPlacements(self, dm, concept):
+        """Generate the placements of dm's vary span that make desEq stable.
+
+        concept is 'nash', 'gmr' or 'smr'. Only the set of states ranked above
+        desEq matters, so the span's elements are placed above or below desEq
+        one at a time. Yields (top, middle, bottom) for each stable placement;
+        the span can then be any ordering of top, then middle, then any
+        ordering of bottom.
+        """
+        full = list(self.conflict.decisionMakers[dm].preferenceRanking)
+        span = self.vary[dm] if self.vary is not None else [0, 0]
+
+        def states(element):
+            if isinstance(element, list):
+                return [state - 1 for state in element]
+            return [element - 1]
+
+        desIdx = [idx for idx, element in enumerate(full)
+                  if self.desEq in states(element)][0]
+        equal = set(states(full[desIdx]))
+        if not span[0] <= desIdx < span[1]:
+            # every ordering of the span gives the same states above desEq
+            above = {state for element in full[:desIdx]
+                     for state in states(element)}
+            if self._stableAbove(dm, concept, above, equal):
+                yield full[span[0]:span[1]], [], []
+            return
+
+        others = [element for idx, element in enumerate(full[span[0]:span[1]])
+                  if idx + span[0] != desIdx]
+        fixedAbove = {state for element in full[:span[0]]
+                      for state in states(element)}
+        mustBeLower = set(self.mustBeLowerNash[dm])
+
+        def place(idx, chosen, above):
+            if idx == len(others):
+                if self._stableAbove(dm, concept, above, equal):
+                    yield ([others[n] for n in chosen], [full[desIdx]],
+                           [element for n, element in enumerate(others)
+                            if n not in chosen])
+                return
+            # others[idx] ranked below desEq
+            yield from place(idx + 1, chosen, above)
+            # others[idx] ranked above desEq; for Nash, this can't be a move
+            # available from desEq
+            newAbove = set(states(others[idx]))
+            if concept == 'nash' and newAbove & mustBeLower:
+                return
+            yield from place(idx + 1, chosen + [idx], above | newAbove)
+
+        yield from place(0, [], fixedAbove)
+
+    def _dmRankings(self, dm, concept):
+        """Generate dm's rankings within its vary span that make desEq stable.
+
+        concept is 'nash', 'gmr' or 'smr'. Orderings are only generated for
+        the placements from _dmPlacements.
+        """
+        full = list(self.conflict.decisionMakers[dm].preferenceRanking)
+        span = self.vary[dm] if self.vary is not None else [0, 0]
+        for top, middle, bottom in self._dmPlacements(dm, concept):
+            for upper in itertools.permutations(top):
+                for lower in itertools.permutations(bottom):
+                    yield (full[:span[0]] + list(upper) + middle +
+                           list(lower) + full[span[1]:])
+
+    def _dmCount(self, dm, concept):
+        """Count dm's rankings that make desEq stable, as from _dmRankings."""
+        return sum(math.factorial(len(top)) * math.factorial(len(bottom))
+                   for top, middle, bottom in self._dmPlacements(dm, concept))
+
+    def _spans(self):
+        """The vary span of each DM, [0, 0] if its ranking is fixed."""
+        if self.vary is None:
+            return [[0, 0] for dm in self.conflict.decisionMakers]
+        return [list(span) for span in self.vary]
+
+    def permutationCount(self):
+        """Number of preference rankings allowed by the vary spans."""
+        count = 1
+        for start, end in self._spans():
+            count *= math.factorial(max(end - start, 0))
+        return count
+
+    def validRankings(self, concept='Nash', chunkSize=1000):
+        """Generate only the rankings that make desEq an equilibrium.
+
+        concept is 'Nash', 'SEQ', 'GMR' or 'SMR'. Rankings are in the same
+        form as from prefPermGen, but are found by a search that skips
+        placements which can't be stable. Nash, GMR and SMR stability for a DM
+        depend only on that DM's ranking, so valid rankings are combined
+        across DMs. SEQ implies GMR, so rankings valid by GMR for every DM are
+        checked in chunks of chunkSize for SEQ.
+        """
+        key = concept.lower()
+        if key not in ('nash', 'seq', 'gmr', 'smr'):
+            raise ValueError("Unknown stability concept: {}".format(concept))
+        self._mblInit()
+        search = 'gmr' if key == 'seq' else key
+        perDM = []
+        for dm in range(len(self.conflict.decisionMakers)):
+            perDM.append(list(self._dmRankings(dm, search)))
+            if not perDM[-1]:
+                # no ranking for this DM works, whatever the others are
+                return
+        candidates = itertools.product(*perDM)
+        if key != 'seq':
+            yield from candidates
+            return
+        while True:
+            rankings = list(itertools.islice(candidates, chunkSize))
+            if not rankings:
+                return
+            seq = self._checkRankings(rankings)[2].all(axis=1)
+            yield from itertools.compress(rankings, seq)
+
+    def countEquilibria(self, chunkSize=1000):
+        """Count the rankings that make desEq an equilibrium by each concept.
+
+        Nash, GMR and SMR stability are separable by DM, so those counts are
+        products of the per-DM counts from _dmCount and no rankings are
+        generated. SEQ depends on every DM's ranking, so the rankings valid
+        by GMR are generated and checked for SEQ, chunkSize at a time.
+
+        Sets counts and numRankings as findEquilibria(countOnly=True) does.
+        """
+        self._mblInit()
+        numDMs = len(self.conflict.decisionMakers)
+        counts = {}
+        for key in ('nash', 'gmr', 'smr'):
+            counts[key] = 1
+            for dm in range(numDMs):
+                counts[key] *= self._dmCount(dm, key)
+        counts['seq'] = 0
+        if counts['gmr']:
+            counts['seq'] = sum(1 for ranking in
+                                self.validRankings('SEQ', chunkSize))
+        self.counts = np.array([counts[key] for key in
+                                ('nash', 'seq', 'gmr', 'smr')])
+        self.numRankings = self.permutationCount()
+        self.preferenceRankings = None
+        self.nash = self.gmr = self.seq = self.smr = None
+        self.equilibriums = None
+
+    def sampleEquilibria(self, samples=10000, seed=None, confidence=0.95,
+                         chunkSize=1000):
+        """Estimate the equilibrium counts from uniformly sampled rankings.
+
+        For spaces too large to enumerate. Each sample orders every DM's vary
+        span uniformly at random, from a numpy RandomState seeded with seed,
+        so results can be reproduced. Sets:
+        numSamples, sampleCounts: samples checked, and how many of them are
+            equilibria by Nash, SEQ, GMR and SMR.
+        numRankings: total rankings allowed by the vary spans.
+        estimates: sampleCounts scaled up to numRankings.
+        intervals: concepts x 2, lower and upper bounds on the count from
+            Wilson score intervals at the given confidence level.
+        """
+        self._mblInit()
+        rng = np.random.RandomState(seed)
+        fulls = [list(dm.preferenceRanking)
+                 for dm in self.conflict.decisionMakers]
+        spans = self._spans()
+        hits = np.zeros(4, np.int_)
+        done = 0
+        while done < samples:
+            size = min(chunkSize, samples - done)
+            orders = [np.argsort(rng.rand(size, max(end - start, 0)), axis=1)
+                      + start for start, end in spans]
+            rankings = []
+            for n in range(size):
+                rankings.append(tuple(
+                    full[:start] + [full[idx] for idx in order[n]] +
+                    full[max(end, start):]
+                    for full, (start, end), order in zip(fulls, spans,
+                                                         orders)))
+            nash, gmr, seq, smr = self._checkRankings(rankings)
+            hits += [stab.all(axis=1).sum() for stab in (nash, seq, gmr, smr)]
+            done += size
+
+        self.numSamples = samples
+        self.sampleCounts = hits
+        self.numRankings = self.permutationCount()
+        total = float(self.numRankings)
+        p = hits / samples
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        centre = (p + z ** 2 / (2 * samples)) / (1 + z ** 2 / samples)
+        halfWidth = (z * np.sqrt(p * (1 - p) / samples +
+                                 z ** 2 / (4 * samples ** 2)) /
+                     (1 + z ** 2 / samples))
+        # the bounds are exactly 0 or 1 when no or all samples are equilibria
+        lower = np.where(hits == 0, 0., centre - halfWidth)
+        upper = np.where(hits == samples, 1., centre + halfWidth)
+        self.estimates = p * total
+        self.intervals = np.column_stack((lower, upper)) * total
+
+    def _collectEquilibria(self, chunks, filt, countOnly):
+        """Count and keep the results of chunks from iterEquilibria.
+
+        Returns (counts, numRankings, kept), where kept has lists of the
+        rankings kept and of their nash, gmr, seq and smr arrays.
+        """
+        kept = [[] for idx in range(5)]
+        counts = np.zeros(4, np.int_)
+        numRankings = 0
+        for rankings, nash, gmr, seq, smr in chunks:
+            eqms = np.vstack((nash.all(axis=1), seq.all(axis=1),
+                              gmr.all(axis=1), smr.all(axis=1)))
+            counts += eqms.sum(axis=1)
+            numRankings += len(rankings)
+            if countOnly:
+                continue
+            keep = np.ones(len(rankings), bool)
+            if filt is not None:
+                keep = np.greater_equal(eqms.T, filt).all(axis=1)
+            kept[0].extend(ranking for ranking, k in zip(rankings, keep) if k)
+            for idx, stab in enumerate((nash, gmr, seq, smr)):
+                kept[idx + 1].append(stab[keep])
+        return counts, numRankings, kept
+
+    def findEquilibria(self, filt=None, countOnly=False, chunkSize=1000,
+                       search=None, workers=None):
+        """Check all requested preference rankings for stability at desEq.
+
+        Rankings are checked in chunks of chunkSize, so only the results that
+        are kept use memory:
+        filt: if given, a list of four booleans for Nash, SEQ, GMR and SMR,
+            as for filter(). Only rankings meeting it are kept.
+        countOnly: keep no rankings, only the counts. countEquilibria gets
+            the same counts without checking every ranking.
+        search: if given a concept ('Nash', 'SEQ', 'GMR' or 'SMR'), only
+            the rankings that make desEq an equilibrium by it are generated
+            and checked (see validRankings), so counts and numRankings only
+            cover those rankings.
+        workers: if greater than 1, the rankings from prefPermGen are split
+            into shards (see shardRankings) that are checked in that many
+            processes, and the results are merged in prefPermGen order, so
+            they are identical to a serial run. Not used with search.
+
+        Sets preferenceRankings, nash, gmr, seq, smr (rankings x DMs) and
+        equilibriums (concepts x rankings) for the rankings kept, or None if
+        countOnly. counts has the number of rankings that are equilibria by
+        each concept, out of numRankings checked in total.
+        """
+        numDMs = len(self.conflict.decisionMakers)
+        if workers is not None and workers > 1 and search is None:
+            self.counts, self.numRankings, kept = self._parallelEquilibria(
+                workers, filt, countOnly, chunkSize)
+        else:
+            self.counts, self.numRankings, kept = self._collectEquilibria(
+                self.iterEquilibria(chunkSize, search), filt, countOnly)
+
+        if countOnly:
+            self.preferenceRankings = None
+            self.nash = self.gmr = self.seq = self.smr = None
+            self.equilibriums = None
+            return
+        self.preferenceRankings = kept[0]
+        self.nash, self.gmr, self.seq, self.smr = [
+            np.concatenate([np.zeros((0, numDMs), bool)] + stab)
+            for stab in kept[1:]]
+        self.equilibriums = np.vstack((self.nash.all(axis=1),
+                                       self.seq.all(axis=1),
+                                       self.gmr.all(axis=1),
+                                       self.smr.all(axis=1)))
+
+    def _parallelEquilibria(self, workers, filt, countOnly, chunkSize):
+        """Check the rankings from prefPermGen in shards across a pool.
+
+        About four shards are made per worker, each a range of combinations
+        of the leading DMs' rankings. Each worker rebuilds the conflict once.
+        Shards are merged in order, so the results are as from
+        _collectEquilibria over every ranking.
+        """
+        numPrefix, combinations = self._shardPrefix(4 * workers)
+        shardSize = max(1, -(-combinations // (4 * workers)))
+        tasks = [((numPrefix, start, min(start + shardSize, combinations)),
+                  filt, countOnly, chunkSize)
+                 for start in range(0, combinations, shardSize)]
+        conflictRep = json.loads(json.dumps(self.conflict.export_rep()))
+        counts = np.zeros(4, np.int_)
+        numRankings = 0
+        kept = [[] for idx in range(5)]
+        with multiprocessing.Pool(workers, _initInverseWorker,
+                                  (conflictRep, self.vary,
+                                   self.desEq)) as pool:
+            for shardCounts, shardRankings, shardKept in pool.imap(
+                    _inverseWorker, tasks):
+                counts += shardCounts
+                numRankings += shardRankings
+                for merged, part in zip(kept, shardKept):
+                    merged.extend(part)
+        return counts, numRankings, kept
 
     def filter(self, filt):
+        """Rankings (with equilibrium flags) meeting filt, and the counts.
+
+        filt is a list of four booleans for Nash, SEQ, GMR and SMR; a ranking
+        is listed if it is an equilibrium by every concept marked True.
+        """
         values = []
         for pRanki, prefRank in enumerate(self.preferenceRankings):
             eqms = self.equilibriums[:, pRanki]
             if np.greater_equal(eqms, filt).all():
                 values.append(tuple(list(prefRank) + ["Y" if bool(x) else "" for x in eqms]))
-        counts = self.equilibriums.sum(axis=1)
-        return values, counts
+        return values, self.counts
+
+
+def _initInverseWorker(conflictRep, vary, desEq):
+    """Build an InverseSolver in a worker process from the conflict's JSON."""
+    from data_01_conflictModel import ConflictModel
+    conflict = ConflictModel()
+    conflict.json_import(conflictRep)
+    _worker['inverse'] = InverseSolver(conflict, vary, desEq)
+
+
+def _inverseWorker(task):
+    """Counts and kept results for one shard of the inverse rankings."""
+    shard, filt, countOnly, chunkSize = task
+    solver = _worker['inverse']
+    return solver._collectEquilibria(
+        solver.iterEquilibria(chunkSize, shard=shard), filt, countOnly)
+
+
+def _segmentAny(mask, starts):
+    """For each run mask[:, starts[i]:starts[i + 1]], True if any are set."""
+    counts = np.zeros((len(mask), mask.shape[1] + 1), np.int_)
+    np.cumsum(mask, axis=1, out=counts[:, 1:])
+    return counts[:, starts[1:]] > counts[:, starts[:-1]]
+
+
+def _segmentFirst(mask, starts):
+    """For each run of mask, as for _segmentAny, the index of the first set
+    element, or mask.shape[1] if there is none.
+    """
+    width = mask.shape[1]
+    positions = np.where(mask, np.arange(width), width)
+    positions = np.hstack((positions, np.full((len(mask), 1), width)))
+    return np.minimum.reduceat(positions, np.minimum(starts[:-1], width),
+                               axis=1)
 
 
 class GoalSeeker(RMGenerator):
@@ -1093,9 +2247,365 @@ class LessThanOneOf:
                                     self.co.name)
 
 
+def _boolProduct(a, b):
+    """Boolean matrix product of two 2D boolean arrays."""
+    return (a.astype(np.float32) @ b.astype(np.float32)) > 0
+
+
+class LazySolver(LogicalSolver):
+    """Answers stability queries for individual states on demand.
+
+    Unlike LogicalSolver, no reachability or preference matrices are built.
+    Reachable states, preferences and misperceptions are worked out only for
+    the states that a query touches, and memoized. Intended for checking a
+    few states of a large conflict with is_stable().
+    """
+
+    def __init__(self, conflict, useCoalitions=True):
+        """Create a lazy solver."""
+        self.conflict = conflict
+
+        if useCoalitions:
+            if len(self.conflict.coalitions) == 0:
+                for dm in self.conflict.decisionMakers:
+                    self.conflict.coalitions.append(dm)
+            self.effectiveDMs = self.conflict.coalitions
+        else:
+            self.effectiveDMs = self.conflict.decisionMakers
+
+        self.conflict.options.set_indexes()
+        allOptions = (1 << len(self.conflict.options)) - 1
+        self.irreversible = [(option.dec_val, option.permittedDirection)
+                             for option in self.conflict.options
+                             if option.permittedDirection in ("fwd", "back")]
+
+        # focal option bits, and bits controlled by nobody, for each DM
+        self.focalBits = {}
+        self.uncontrolled = {}
+        controlled = 0
+        for dm in self.effectiveDMs:
+            self.focalBits[dm] = [option.dec_val for option in dm.options]
+            controlled |= sum(self.focalBits[dm])
+        for dm in self.effectiveDMs:
+            self.uncontrolled[dm] = allOptions & ~controlled
+
+        for dm in self._individuals():
+            if self.conflict.useManualPreferenceRanking:
+                dm.calculatePreferences()
+            else:
+                dm.preferences.validate()
+
+        self._reachable = {}
+        self._prefKeys = {}
+        self._misperceived = {}
+        self._initCaches()
+
+    def _individuals(self):
+        """All DecisionMakers involved, including coalition members."""
+        dms = []
+        for dm in self.effectiveDMs:
+            for member in (dm.members if dm.isCoalition else [dm]):
+                if member not in dms:
+                    dms.append(member)
+        return dms
+
+    def chattyHelper(self, co, state):
+        """Generate narration for verbose stability calculations."""
+        return 'state {} (decimal {})'.format(
+            state + 1, self.conflict.feasibles.decimal[state])
+
+    def misperceives(self, dm, stateIdx):
+        """True if dm (or every member of coalition dm) can't see state."""
+        key = (dm, stateIdx)
+        if key not in self._misperceived:
+            if dm.isCoalition:
+                result = all(self.misperceives(member, stateIdx)
+                             for member in dm.members)
+            else:
+                code = self.conflict.feasibles.decimal[stateIdx]
+                result = any(misp.test(code) for misp in dm.misperceptions)
+            self._misperceived[key] = result
+        return self._misperceived[key]
+
+    def _misperceivesMany(self, dm, codes):
+        """Vectorized misperceives() over an array of decimal states."""
+        if dm.isCoalition:
+            result = np.ones(len(codes), bool)
+            for member in dm.members:
+                result &= self._misperceivesMany(member, codes)
+            return result
+        if not len(dm.misperceptions):
+            return np.zeros(len(codes), bool)
+        return dm.misperceptions.test_many(codes).any(axis=1)
+
+    def reachable(self, dm, stateIdx):
+        """List all states reachable by a decisionMaker or coalition from state.
+
+        dm: a DecisionMaker or Coalition that was passed to the constructor.
+        stateIdx: the index of the state in the conflict.
+        """
+        if dm not in self.effectiveDMs:
+            raise ValueError("DM or Coalition not valid.")
+        key = (dm, stateIdx)
+        if key not in self._reachable:
+            self._reachable[key] = self._findReachable(dm, stateIdx)
+        return self._reachable[key]
+
+    def _findReachable(self, dm, stateIdx):
+        """Reachable states, found by varying the options dm controls."""
+        code = self.conflict.feasibles.decimal[stateIdx]
+        if code & self.uncontrolled[dm] or self.misperceives(dm, stateIdx):
+            return []
+        candidates = np.array([code & ~sum(self.focalBits[dm])], np.uint64)
+        for bit in self.focalBits[dm]:
+            candidates = np.concatenate((candidates,
+                                         candidates | np.uint64(bit)))
+        for bit, direction in self.irreversible:
+            taken = (candidates & np.uint64(bit)) != 0
+            if direction == "fwd" and code & bit:
+                candidates = candidates[taken]
+            elif direction == "back" and not code & bit:
+                candidates = candidates[~taken]
+        reach = self.conflict.feasibles.decimal.positions(candidates)
+        keep = (reach >= 0) & (reach != stateIdx)
+        keep[keep] = ~self._misperceivesMany(dm, candidates[keep])
+        return sorted(reach[keep].tolist())
+
+    def UIs(self, dm, stateIdx, refState=None):
+        """List unilateral improvements available to dm from state.
+
+        As for RMGenerator.UIs.
+        """
+        if refState is None:
+            refState = stateIdx
+        reach = self.reachable(dm, stateIdx)
+        if not reach:
+            return []
+        return np.asarray(reach)[self._improvesAt(dm, refState,
+                                                  reach)].tolist()
+
+    def _moves(self, dm, stateIdx, uiOnly=False):
+        """As for RMGenerator._moves, but from the memoized lists."""
+        if uiOnly:
+            return self.UIs(dm, stateIdx)
+        return self.reachable(dm, stateIdx)
+
+    def preferenceKey(self, dm, stateIdx):
+        """A value for state that orders states by dm's preference."""
+        key = (dm, stateIdx)
+        if key not in self._prefKeys:
+            if self.conflict.useManualPreferenceRanking:
+                result = dm.payoffs[stateIdx]
+            else:
+                # lexicographic on the preference statements satisfied
+                code = self.conflict.feasibles.decimal[stateIdx]
+                result = tuple(pref.test(code) for pref in dm.preferences)
+            self._prefKeys[key] = result
+        return self._prefKeys[key]
+
+    def improves(self, dm, state0, state1):
+        """True if dm prefers state1 to state0.
+
+        For coalitions, every member must prefer state1.
+        """
+        if dm.isCoalition:
+            return all(self.improves(member, state0, state1)
+                       for member in dm.members)
+        return (self.preferenceKey(dm, state1) >
+                self.preferenceKey(dm, state0))
+
+    def improvesMany(self, dm, state0, codes, positions):
+        """Vectorized improves() over an array of feasible states.
+
+        codes and positions give the decimal values and indexes of the states.
+        """
+        if dm.isCoalition:
+            result = np.ones(len(codes), bool)
+            for member in dm.members:
+                result &= self.improvesMany(member, state0, codes, positions)
+            return result
+        if self.conflict.useManualPreferenceRanking:
+            payoffs = np.asarray(dm.payoffs)
+            return payoffs[positions] > payoffs[state0]
+        if not len(dm.preferences):
+            return np.zeros(len(codes), bool)
+        # the first preference statement that differs from state0 decides.
+        rows = dm.preferences.test_many(codes)
+        differs = rows != np.array(self.preferenceKey(dm, state0), bool)
+        first = differs.argmax(axis=1)
+        return differs.any(axis=1) & rows[np.arange(len(codes)), first]
+
+    def _improvesAt(self, dm, state0, states):
+        """Vectorized improves() over an array of state indexes."""
+        states = np.asarray(states, np.int_)
+        codes = np.asarray(self.conflict.feasibles.decimal)[states]
+        return self.improvesMany(dm, state0, codes, states)
+
+    def simSanctions(self, dm, state0):
+        """Not calculated ahead of time; see simSanctionMask."""
+        return None
+
+    def simSanctionMask(self, dm, state0, decimals):
+        """Test an array of decimal values for states that sanction dm.
+
+        As for LogicalSolver.simSanctionMask.
+        """
+        positions = self.conflict.feasibles.decimal.positions(decimals)
+        valid = positions >= 0
+        result = np.zeros(len(decimals), bool)
+        result[valid] = ~self.improvesMany(dm, state0, decimals[valid],
+                                           positions[valid])
+        return result
+
+
 class MatrixCalc(RMGenerator):
+    """Solves the conflict for equilibria using matrix operations.
+
+    Stabilities for every state are found at once from boolean products of
+    the reachability and preference matrices, following the matrix
+    formulation of the stability definitions by Xu et al. Results match
+    LogicalSolver, but no narration is generated.
+
+    After findEquilibria, self.sanctions[concept][dmIdx] is a BitMatrix that
+    is True at [state0, state1] if a move by the DM from state0 to state1 is
+    sanctioned under that concept ('gmr', 'seq' or 'smr').
+    """
+
     def __init__(self, conflict):
-        RMGenerator.__init__(conflict)
+        """Create a matrix solver."""
+        RMGenerator.__init__(self, conflict)
+        self.reach = []
+        self.improve = []
+        self.uis = []
+        for dm in self.effectiveDMs:
+            reach = dm.reachability.toDense(bool)
+            improve = dm.improvements.toDense()
+            self.reach.append(reach)
+            self.improve.append(improve)
+            self.uis.append(reach & improve)
+        self._sequences = {}
+        self.sanctions = {}
+
+    def sequenceMoves(self, dmIdxs, uiOnly=False):
+        """States reachable by a sequence of moves by distinct DMs.
+
+        Element [state1, state2] is True if state2 can be reached from state1
+        by one or more moves, each made by a different DM from dmIdxs. If
+        uiOnly, each move must be a UI for the DM making it.
+        """
+        key = (frozenset(dmIdxs), uiOnly)
+        if key not in self._sequences:
+            moves = self.uis if uiOnly else self.reach
+            numStates = len(self.conflict.feasibles)
+            result = np.zeros((numStates, numStates), bool)
+            for dmIdx in dmIdxs:
+                result |= moves[dmIdx]
+                rest = [d for d in dmIdxs if d != dmIdx]
+                if rest:
+                    result |= _boolProduct(moves[dmIdx],
+                                           self.sequenceMoves(rest, uiOnly))
+            self._sequences[key] = result
+        return self._sequences[key]
+
+    def _sanctioned(self, dmIdx, uiOnly=False, countermove=False):
+        """Matrix of moves by the DM that the other DMs can sanction."""
+        others = [d for d in range(len(self.effectiveDMs)) if d != dmIdx]
+        responses = self.sequenceMoves(others, uiOnly)
+        # sanction[state0, state2]: state2 is not an improvement on state0
+        sanction = ~self.improve[dmIdx]
+        if countermove:
+            # the focal DM may not be able to escape to an improvement on
+            # state0 after being sanctioned.
+            sanction &= ~_boolProduct(self.improve[dmIdx],
+                                      self.uis[dmIdx].T)
+        return _boolProduct(sanction, responses.T)
+
+    def _stabilities(self, concept, uiOnly=False, countermove=False):
+        """Boolean DMs x states array of stability under a sanction concept."""
+        sanctions = []
+        stable = np.zeros((len(self.effectiveDMs),
+                           len(self.conflict.feasibles)), bool)
+        for dmIdx in range(len(self.effectiveDMs)):
+            sanctioned = self._sanctioned(dmIdx, uiOnly, countermove)
+            sanctions.append(BitMatrix.fromDense(sanctioned))
+            stable[dmIdx] = ~(self.uis[dmIdx] & ~sanctioned).any(axis=1)
+        self.sanctions[concept] = sanctions
+        return stable
+
+    def nash(self):
+        """Nash stability of every state for every DM."""
+        return np.array([~ui.any(axis=1) for ui in self.uis]).reshape(
+            len(self.effectiveDMs), len(self.conflict.feasibles))
+
+    def gmr(self):
+        """GMR stability of every state for every DM."""
+        return self._stabilities('gmr')
+
+    def seq(self):
+        """SEQ stability of every state for every DM."""
+        return self._stabilities('seq', uiOnly=True)
+
+    def smr(self):
+        """SMR stability of every state for every DM."""
+        return self._stabilities('smr', countermove=True)
+
+    def sim(self):
+        """SIM stability of every state for every DM.
+
+        Other DMs respond simultaneously, each either staying put or taking
+        one of their UIs from the original state.
+        """
+        codes = self.conflict.feasibles.codes.astype(np.int64)
+        numStates = len(codes)
+        stable = np.ones((len(self.effectiveDMs), numStates), bool)
+        for dmIdx in range(len(self.effectiveDMs)):
+            others = [d for d in range(len(self.effectiveDMs)) if d != dmIdx]
+            for state0 in np.flatnonzero(self.uis[dmIdx].any(axis=1)):
+                # all combined changes in decimal value from opponent moves
+                offsets = np.zeros(1, np.int64)
+                for oIdx in others:
+                    moves = codes[self.uis[oIdx][state0]] - codes[state0]
+                    offsets = np.unique(
+                        (offsets[:, np.newaxis] +
+                         np.append(0, moves)[np.newaxis, :]).ravel())
+                targets = codes[self.uis[dmIdx][state0]]
+                finals = self.conflict.feasibles.decimal.positions(
+                    (targets[:, np.newaxis] + offsets[np.newaxis, :]).ravel()
+                ).reshape(len(targets), len(offsets))
+                feasible = finals >= 0
+                sanctioned = feasible & ~self.improve[dmIdx][state0,
+                                                            finals]
+                stable[dmIdx, state0] = sanctioned.any(axis=1).all()
+        return stable
+
+    def findEquilibria(self):
+        """Calculate equilibrium states for each stability concept."""
+        nash = self.nash()
+        gmr = self.gmr()
+        seq = self.seq()
+        sim = self.sim()
+        smr = self.smr()
+
+        self.nashStabilities = nash.astype(np.float64)
+        self.gmrStabilities = gmr.astype(np.float64)
+        self.seqStabilities = seq.astype(np.float64)
+        self.simStabilities = sim.astype(np.float64)
+        self.smrStabilities = smr.astype(np.float64)
+
+        self.nashEquilibria = nash.all(axis=0)
+        self.gmrEquilibria = gmr.all(axis=0)
+        self.seqEquilibria = seq.all(axis=0)
+        self.simEquilibria = sim.all(axis=0)
+        self.seqSimEquilibria = (seq | sim).all(axis=0)
+        self.smrEquilibria = smr.all(axis=0)
+
+        # output
+        self.allEquilibria = np.vstack((self.nashEquilibria,
+                                        self.gmrEquilibria,
+                                        self.seqEquilibria,
+                                        self.simEquilibria,
+                                        self.seqSimEquilibria,
+                                        self.smrEquilibria))
 
 
 def main():
@@ -5,13 +5,380 @@
 import itertools
 import numpy
 
-bitFlip = {'N': 'Y', 'Y': 'N'}
+
+def _popcount(x):
+    """Return the number of set bits in the non-negative integer x."""
+    return bin(x).count('1')
+
+
+class MaskPattern:
+    """A set of states stored as a pair of integer bitmasks.
+
+    Bit i of 'care' is set if option i is fixed by the pattern, and bit i of
+    'value' is set if that option is taken. This is equivalent to a pattern
+    in 'Y','N','-' notation, where character i corresponds to bit i.
+    """
+
+    __slots__ = ('care', 'value')
+
+    def __init__(self, care, value):
+        """Create a new MaskPattern."""
+        self.care = care
+        self.value = value & care
+
+    @classmethod
+    def fromYND(cls, ynd):
+        """Create a MaskPattern from a 'Y','N','-' string."""
+        care = 0
+        value = 0
+        for idx, char in enumerate(ynd):
+            if char == 'Y':
+                care |= 1 << idx
+                value |= 1 << idx
+            elif char == 'N':
+                care |= 1 << idx
+        return cls(care, value)
+
+    def ynd(self, numOpts):
+        """Return the pattern as a 'Y','N','-' string of length numOpts."""
+        out = []
+        for idx in range(numOpts):
+            bit = 1 << idx
+            if not self.care & bit:
+                out.append('-')
+            elif self.value & bit:
+                out.append('Y')
+            else:
+                out.append('N')
+        return ''.join(out)
+
+    def count(self, numOpts):
+        """Number of states in the pattern."""
+        return 2 ** (numOpts - _popcount(self.care))
+
+    def overlaps(self, other):
+        """Return True if the patterns share at least one state."""
+        return not (self.care & other.care & (self.value ^ other.value))
+
+    def covers(self, other):
+        """Return True if every state in 'other' is also in this pattern."""
+        return (self.care & ~other.care == 0 and
+                (self.value ^ other.value) & self.care == 0)
+
+    def test(self, state):
+        """Return True if decimal 'state' is within the pattern."""
+        return state & self.care == self.value
+
+    def __eq__(self, other):
+        return self.care == other.care and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.care, self.value))
+
+    def __repr__(self):
+        return 'MaskPattern({}, {})'.format(self.care, self.value)
+
+
+def _uniqueMasks(masks):
+    """Remove duplicate MaskPatterns, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for mask in masks:
+        if mask not in seen:
+            seen.add(mask)
+            unique.append(mask)
+    return unique
+
+
+def _maskArrays(masks):
+    """Return the care and value masks of a list of patterns as arrays."""
+    cares = numpy.array([m.care for m in masks], numpy.uint64)
+    values = numpy.array([m.value for m in masks], numpy.uint64)
+    return cares, values
+
+
+def _mergeMasks(masks):
+    """Merge phase of the minimizer (Quine-McCluskey style).
+
+    Patterns are bucketed by their dash positions and the number of 'Y'
+    values, so each pattern is only compared against patterns in the
+    neighbouring bucket that differ from it in exactly one bit. Merged
+    patterns take the position of their first parent. Repeats until no
+    further merges are possible.
+    """
+    masks = _uniqueMasks(masks)
+    while True:
+        buckets = {}
+        for idx, mask in enumerate(masks):
+            key = (mask.care, _popcount(mask.value))
+            buckets.setdefault(key, {}).setdefault(mask.value, idx)
+        merged = []
+        used = set()
+        for idx, mask in enumerate(masks):
+            upper = buckets.get((mask.care, _popcount(mask.value) + 1))
+            if not upper:
+                continue
+            bits = mask.care & ~mask.value
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                partner = upper.get(mask.value | bit)
+                if partner is not None:
+                    merged.append((min(idx, partner),
+                                   MaskPattern(mask.care & ~bit, mask.value)))
+                    used.update((idx, partner))
+        if not merged:
+            return masks
+        nextMasks = [(idx, mask) for idx, mask in enumerate(masks)
+                     if idx not in used] + merged
+        nextMasks.sort(key=lambda x: x[0])
+        masks = _uniqueMasks([mask for idx, mask in nextMasks])
+
+
+def _absorbMasks(masks):
+    """Remove patterns that are wholly contained in another single pattern."""
+    cares, values = _maskArrays(masks)
+    alive = numpy.ones(len(masks), bool)
+    for idx, mask in enumerate(masks):
+        care = numpy.uint64(mask.care)
+        value = numpy.uint64(mask.value)
+        containers = ((care & cares) == cares) & ((value & cares) == values)
+        containers &= alive
+        containers[idx] = False
+        if containers.any():
+            alive[idx] = False
+    return [m for m, a in zip(masks, alive) if a]
+
+
+def _uncoveredCount(care, value, cares, values, numOpts, anyMissed=False):
+    """Number of states in the pattern (care, value) outside arrays of
+    patterns. If anyMissed, stops at the first part found to be missed.
+
+    Only the options fixed by patterns that overlap it matter. If there are
+    few of those, the states they give are tested directly; otherwise the
+    pattern is split on the option that most of the patterns fix, and each
+    half is counted against the patterns that overlap it (as in Espresso's
+    tautology check).
+    """
+    care64 = numpy.uint64(care)
+    near = (cares & care64 & (values ^ numpy.uint64(value))) == 0
+    cares = cares[near]
+    values = values[near]
+    freeCount = numOpts - _popcount(care)
+    if not len(cares):
+        return 1 << freeCount
+    if ((cares & ~care64) == 0).any():
+        # a single pattern holds all of it
+        return 0
+    free = int(numpy.bitwise_or.reduce(cares)) & ~care
+    freeBits = [1 << idx for idx in range(free.bit_length()) if free >> idx & 1]
+    if len(cares) << len(freeBits) <= 1 << 16:
+        states = numpy.array([value], numpy.uint64)
+        for bit in freeBits:
+            states = (states[:, numpy.newaxis] |
+                      numpy.array([0, bit], numpy.uint64)).ravel()
+        missed = int((~((states[:, numpy.newaxis] & cares) == values)
+                      .any(axis=1)).sum())
+        return missed << (freeCount - len(freeBits))
+    bits = numpy.array(freeBits, numpy.uint64)
+    bit = freeBits[int(((cares[:, numpy.newaxis] & bits) != 0)
+                       .sum(axis=0).argmax())]
+    missed = _uncoveredCount(care | bit, value, cares, values, numOpts,
+                             anyMissed)
+    if missed and anyMissed:
+        return missed
+    return missed + _uncoveredCount(care | bit, value | bit, cares, values,
+                                    numOpts, anyMissed)
+
+
+def _coveredBy(care, value, cares, values):
+    """Check if the pattern (care, value) is covered by arrays of patterns."""
+    return not _uncoveredCount(care, value, cares, values, 64, True)
+
+
+def _expandMasks(masks):
+    """Expansion phase of the minimizer (Espresso style).
+
+    Each pattern is grown one literal at a time, provided that the grown
+    pattern stays within the set and swallows at least one other pattern.
+    Swallowed patterns are removed.
+    """
+    masks = list(masks)
+    cares, values = _maskArrays(masks)
+    idx = 0
+    while idx < len(masks):
+        mask = masks[idx]
+        bits = mask.care
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            grown = MaskPattern(mask.care & ~bit, mask.value)
+            gCare = numpy.uint64(grown.care)
+            swallowed = (((cares & gCare) == gCare) &
+                         ((values & gCare) == numpy.uint64(grown.value)))
+            swallowed[idx] = False
+            if not swallowed.any():
+                continue
+            # grown is mask plus its mirror image across bit, so only the
+            # mirror has to be covered by the other patterns.
+            if _coveredBy(mask.care, mask.value ^ bit, cares, values):
+                mask = grown
+                keep = ~swallowed
+                idx -= int(swallowed[:idx].sum())
+                masks = [m for m, k in zip(masks, keep) if k]
+                cares = cares[keep]
+                values = values[keep]
+                masks[idx] = mask
+                cares[idx] = mask.care
+                values[idx] = mask.value
+        idx += 1
+    return masks
+
+
+def _irredundantMasks(masks):
+    """Cover reduction: drop patterns covered by the union of the others.
+
+    Patterns with the fewest states are tried first.
+    """
+    cares, values = _maskArrays(masks)
+    alive = numpy.ones(len(masks), bool)
+    order = sorted(range(len(masks)),
+                   key=lambda i: (-_popcount(masks[i].care), -i))
+    for idx in order:
+        others = alive.copy()
+        others[idx] = False
+        if _coveredBy(masks[idx].care, masks[idx].value, cares[others],
+                      values[others]):
+            alive[idx] = False
+    return [m for m, a in zip(masks, alive) if a]
+
+
+def reduceMasks(masks):
+    """Minimize a list of MaskPatterns into a compact cover of the same states.
+
+    A two-level minimizer: Quine-McCluskey style merging of patterns, removal
+    of contained patterns, Espresso style expansion, then a cover reduction
+    pass. The result may contain overlapping patterns.
+    """
+    masks = _mergeMasks(masks)
+    masks = _absorbMasks(masks)
+    masks = _expandMasks(masks)
+    masks = _irredundantMasks(masks)
+    return masks
+
+
+def subtractMask(feas, sub):
+    """Remove the states in MaskPattern 'sub' from MaskPattern 'feas'."""
+    if not feas.overlaps(sub):
+        return [feas]
+    remaining = []
+    care = feas.care
+    value = feas.value
+    free = sub.care & ~feas.care
+    while free:
+        bit = free & -free
+        free ^= bit
+        remaining.append(MaskPattern(care | bit, value | (~sub.value & bit)))
+        care |= bit
+        value |= sub.value & bit
+    return remaining
+
+
+def expandMask(mask, numOpts):
+    """List the decimal values of all states in a MaskPattern."""
+    freeBits = [1 << idx for idx in range(numOpts) if not mask.care & 1 << idx]
+    states = [mask.value]
+    for bit in reversed(freeBits):
+        states = [st | bit for st in states] + states
+    return states
+
+
+def expandMaskCodes(mask, numOpts):
+    """Decimal values of all states in a MaskPattern, as a uint64 array.
+
+    Each free bit doubles the array by broadcasting the states found so far
+    against that bit, so no intermediate strings or lists are built.
+    """
+    states = numpy.array([mask.value], numpy.uint64)
+    for idx in range(numOpts):
+        if not mask.care & 1 << idx:
+            bit = numpy.array([0, 1 << idx], numpy.uint64)
+            states = (states[:, numpy.newaxis] | bit).ravel()
+    return states
+
+
+def expandMasksToCodes(masks, numOpts):
+    """Sorted, unique decimal values of all states in a list of MaskPatterns.
+
+    Returned as a uint64 array.
+    """
+    if not masks:
+        return numpy.zeros(0, numpy.uint64)
+    codes = numpy.concatenate([expandMaskCodes(mask, numOpts)
+                               for mask in masks])
+    codes.sort()
+    # covers may overlap, so drop repeated states
+    keep = numpy.ones(len(codes), bool)
+    keep[1:] = codes[1:] != codes[:-1]
+    return codes[keep]
+
+
+def codes2yn(codes, numOpts):
+    """Convert an array of decimal states into a list of YN strings."""
+    codes = numpy.asarray(codes, numpy.uint64)
+    if numOpts == 0:
+        return [''] * len(codes)
+    shifts = numpy.arange(numOpts, dtype=numpy.uint64)
+    bits = (codes[:, numpy.newaxis] >> shifts) & numpy.uint64(1)
+    chars = numpy.where(bits.astype(bool), ord('Y'), ord('N')).astype(
+        numpy.uint8)
+    return [s.decode() for s in
+            numpy.ascontiguousarray(chars).view('S{}'.format(numOpts)).ravel()]
+
+
+def testMasks(masks, codes):
+    """Test an array of decimal states against a list of MaskPatterns.
+
+    Returns a boolean array, True where the state matches any of the masks.
+    """
+    codes = numpy.asarray(codes, numpy.uint64)
+    result = numpy.zeros(len(codes), bool)
+    for mask in masks:
+        result |= (codes & numpy.uint64(mask.care)) == numpy.uint64(mask.value)
+    return result
+
+
+def countMasks(masks, numOpts):
+    """Total number of distinct states in a list of MaskPatterns."""
+    cares, values = _maskArrays(masks)
+    total = 0
+    for idx, mask in enumerate(masks):
+        # count only the states not in an earlier pattern
+        total += _uncoveredCount(mask.care, mask.value, cares[:idx],
+                                 values[:idx], numOpts)
+    return total
+
+
+def rmvMask(feas, rmv, numOpts):
+    """Subtract MaskPattern 'rmv' from the list of MaskPatterns 'feas'.
+
+    returns: list feas - rmv, and the number of states removed.
+    """
+    newfeas = []
+    removed = []
+    for mask in feas:
+        newfeas += subtractMask(mask, rmv)
+        if mask.overlaps(rmv):
+            removed.append(MaskPattern(mask.care | rmv.care,
+                                       mask.value | rmv.value))
+    # only the states removed are counted, not the whole of feas
+    return reduceMasks(newfeas), countMasks(removed, numOpts)
 
 
 def reducePatterns(patterns):
     """Reduce patterns into compact dash notation.
 
-    Effectively a partial implementation of the Quine-McCluskey Algorithm?
+    See reduceMasks for the minimization used.
     """
     for p in patterns:
         if len(p) != len(patterns[0]):
@@ -20,41 +387,20 @@ def reducePatterns(patterns):
     if type(patterns) is not list:
         raise TypeError("Patterns must be provided as a list.")
 
-    newPatterns = []
-    matched = []
-    for x, p1 in enumerate(patterns):
-        if x in matched:
-            continue
-        for y, p2 in enumerate(patterns[x + 1:], 1):
-            if x + y in matched:
-                continue
-            diffs = 0
-            for idx, bit in enumerate(zip(p1, p2)):
-                if bit[0] != bit[1]:
-                    diffs += 1
-                    dbit = idx
-                if diffs > 1:
-                    break
-            if diffs == 1:
-                newPatterns.append(p1[:dbit] + '-' + p1[dbit + 1:])
-                matched += [x, x + y]
-                break
-        if x not in matched:
-            newPatterns.append(p1)
-    if matched:
-        newPatterns = reducePatterns(newPatterns)
-    return newPatterns
+    if not patterns:
+        return []
+    numOpts = len(patterns[0])
+    masks = reduceMasks([MaskPattern.fromYND(p) for p in patterns])
+    return [mask.ynd(numOpts) for mask in masks]
 
 
 def expandPatterns(patterns):
     """Expand patterns so that they contain no dashes."""
     newPatterns = []
     for pat in patterns:
-        if '-' in pat:
-            adding = [pat.replace('-', 'Y', 1), pat.replace('-', 'N', 1)]
-            newPatterns += expandPatterns(adding)
-        else:
-            newPatterns += [pat]
+        mask = MaskPattern.fromYND(pat)
+        newPatterns += [dec2yn(st, len(pat))
+                        for st in expandMask(mask, len(pat))]
     return newPatterns
 
 
@@ -80,21 +426,9 @@ def _subtractPattern(feas, sub):
     """Remove infeasible condition 'sub' from feasible condition 'feas'."""
     if len(feas) != len(sub):
         raise ValueError("Patterns have different lengths.")
-    sub = [x for x in enumerate(sub) if x[1] != '-']
-    # check if targ overlaps with state:
-    for x in sub:
-        idx, val = x
-        if feas[idx] == bitFlip[val]:  # if no overlap then no change,
-            return [feas]              # and return the same feasible condition
-    # subtract overlap if it exists
-    remainingStates = []
-    curr = feas
-    for x in sub:
-        idx, val = x
-        if curr[idx] == '-':
-            remainingStates.append(curr[:idx] + bitFlip[val] + curr[idx + 1:])
-            curr = curr[:idx] + val + curr[idx + 1:]
-    return remainingStates
+    remaining = subtractMask(MaskPattern.fromYND(feas),
+                             MaskPattern.fromYND(sub))
+    return [mask.ynd(len(feas)) for mask in remaining]
 
 
 def rmvSt(feas, rmv):
@@ -104,14 +438,10 @@ def rmvSt(feas, rmv):
     rmv: a single YND state.
     returns: list feas - rmv, and the number of states removed.
     """
-    orig = sum([2**x.count('-') for x in feas])  # Original number of states
-    newfeas = []
-    for pattern in feas:
-        newfeas += _subtractPattern(pattern, rmv)
-    newfeas = reducePatterns(newfeas)
-    # number of states removed
-    numRmvd = orig - sum([2**x.count('-') for x in newfeas])
-    return newfeas, numRmvd
+    numOpts = len(rmv)
+    newfeas, numRmvd = rmvMask([MaskPattern.fromYND(x) for x in feas],
+                               MaskPattern.fromYND(rmv), numOpts)
+    return [mask.ynd(numOpts) for mask in newfeas], numRmvd
 
 
 def subtractStateSets(originalStates, statesToRemove):
@@ -132,20 +462,6 @@ def mutuallyExclusive(mutEx):
     return list(itertools.combinations(mutEx, 2))
 
 
-def orderedNumbers(decimalList):
-    """Create translation dictionaries for using ordered numbers.
-
-    Generates the decimal->ordered and ordered->decimal translation
-    dictionaries for a list of decimal values.
-    """
-    toOrdered = {}        # decimal -> ordered dictionary
-    toDecimal = {}         # ordered -> decimal dictionary
-    for i, x in enumerate(decimalList, 1):
-        toOrdered[x] = i
-        toDecimal[i] = x
-    return toOrdered, toDecimal
-
-
 def validatePreferenceRanking(prefRank, feasibles):
     """Check that the preference ranking given is valid."""
     alreadySeen = []
@@ -201,31 +517,31 @@ def prefPriorities2payoffs(preferences, feasibles):
     """Rank the states for a DM, generating payoff values.
 
     Ranking is based on Preference Prioritization, and output payoff values
-    are sequential.
+    are sequential. States are ordered lexicographically by which
+    preference statements they satisfy, earlier statements being more
+    important, so no statement weights are needed.
     """
-    # generate initial payoffs
-    payoffsRaw = numpy.zeros(len(feasibles), numpy.int_)
-    for preference in preferences:
-        for state in feasibles.decimal:
-            if preference.test(state):
-                payoffsRaw[feasibles.toOrdered[state] - 1] += preference.weight
-
-    # Reduce magnitude of payoffs.
-    # Do not do this if weights had special meaning.
-    uniquePayoffs = numpy.unique(payoffsRaw)
+    # states x statements satisfaction matrix, packed so that each row
+    # compares lexicographically as a sequence of bytes.
+    satisfied = numpy.zeros((len(feasibles), len(preferences)), bool)
+    for idx, preference in enumerate(preferences):
+        satisfied[:, idx] = preference.test_many(feasibles.codes)
+    packed = numpy.packbits(satisfied, axis=1)
+
+    # rank of each state amongst the distinct rows, least preferred first.
+    groups, inverse = numpy.unique(packed, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    payoffs = (inverse + 1).astype(numpy.int_)
+
+    # group states of equal rank, as ordered numbers
+    order = numpy.argsort(inverse, kind='stable') + 1
+    bounds = numpy.cumsum(numpy.bincount(inverse, minlength=len(groups)))
     preferenceRanking = []
-    payoffs = payoffsRaw.copy()  # creates a copy
-
-    for idx, value in enumerate(uniquePayoffs):
-        for jdx, pay in enumerate(payoffsRaw):
-            if pay == value:
-                payoffs[jdx] = idx + 1
-        stateSet = [idx + 1 for idx, pay in enumerate(payoffsRaw)
-                    if pay == value]
+    for stateSet in numpy.split(order, bounds[:-1]):
         if len(stateSet) > 1:
-            preferenceRanking.append(stateSet)
-        else:
-            preferenceRanking.append(stateSet[0])
+            preferenceRanking.append(stateSet.tolist())
+        elif len(stateSet) == 1:
+            preferenceRanking.append(int(stateSet[0]))
 
     # necessary to put most preferred states at beginning instead of end
     preferenceRanking.reverse()
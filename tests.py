@@ -28,6 +28,14 @@ class TestStateSetMath(unittest.TestCase):
         a3 = util.reducePatterns(["-Y---", "YY---", "---NY", "NNNY-"])
         self.assertEqual(a3, ["-Y---", "---NY", "NNNY-"])
 
+        # overlapping patterns may be needed to give a minimal cover.
+        orig = ['-NN-NN-', '-YN-NNN', '-NYNNN-', '-YYNNNN', '-NN-NYN',
+                '-NYNNYN', '--N-YNN', '--YNYNN']
+        a6 = util.reducePatterns(orig)
+        self.assertEqual(len(a6), 6)
+        self.assertEqual(sorted(set(util.expandPatterns(a6))),
+                         sorted(set(util.expandPatterns(orig))))
+
         # If elements have different lengths, an exception should be raised.
         with self.assertRaises(ValueError):
             a4 = util.reducePatterns(["N-NN", "Y-N"])
@@ -72,6 +80,152 @@ class TestStateSetMath(unittest.TestCase):
         self.assertEqual(a1, ["YN-Y-", 'NNYY-', '-N-NN'])
         a2 = util.subtractStateSets(['N----', 'YN---'], ["-Y---", "---NY", "NNNY-"])
 
+    def test_maskPatterns(self):
+        # conversion to and from YND notation.
+        m1 = util.MaskPattern.fromYND("Y-N-")
+        self.assertEqual((m1.care, m1.value), (0b0101, 0b0001))
+        self.assertEqual(m1.ynd(4), "Y-N-")
+        self.assertEqual(m1.count(4), 4)
+
+        # expansion gives the same states as the YND expansion.
+        self.assertEqual(sorted(util.expandMask(m1, 4)),
+                         sorted(util.yn2dec(yn) for yn in
+                                util.expandPatterns(["Y-N-"])))
+
+        # subtraction and removal match the string based results.
+        rem = util.subtractMask(util.MaskPattern(0, 0),
+                                util.MaskPattern.fromYND("NYN"))
+        self.assertEqual([m.ynd(3) for m in rem], ['Y--', 'NN-', 'NYY'])
+        res = util.rmvMask([util.MaskPattern.fromYND(p)
+                            for p in ['-N-Y-', '-N-NN']],
+                           util.MaskPattern.fromYND('NNNY-'), 5)
+        self.assertEqual([m.ynd(5) for m in res[0]],
+                         ["YN-Y-", 'NNYY-', '-N-NN'])
+        self.assertEqual(res[1], 2)
+
+    def test_maskCounting(self):
+        # counts and removals agree with the expanded states.
+        rng = numpy.random.RandomState(5)
+        for trial in range(30):
+            masks = [util.MaskPattern(int(care), int(value)) for care, value
+                     in rng.randint(0, 1 << 9, (rng.randint(1, 40), 2))]
+            states = set(util.expandMasksToCodes(masks, 9).tolist())
+            self.assertEqual(util.countMasks(masks, 9), len(states))
+            rmv = util.MaskPattern(*map(int, rng.randint(0, 1 << 9, 2)))
+            res, removed = util.rmvMask(masks, rmv, 9)
+            rmvStates = set(util.expandMask(rmv, 9))
+            self.assertEqual(set(util.expandMasksToCodes(res, 9).tolist()),
+                             states - rmvStates)
+            self.assertEqual(removed, len(states & rmvStates))
+
+    def test_expandToCodes(self):
+        pats = ['-N-Y-', 'YN-Y-', '---NN']
+        codes = util.expandMasksToCodes(
+            [util.MaskPattern.fromYND(p) for p in pats], 5)
+        self.assertEqual(codes.dtype, numpy.uint64)
+        expected = sorted(set(util.yn2dec(yn) for yn in
+                              util.expandPatterns(pats)))
+        self.assertEqual(codes.tolist(), expected)
+        self.assertEqual(util.codes2yn(codes, 5),
+                         [util.dec2yn(dec, 5) for dec in expected])
+
+    def test_feasibleList(self):
+        feas = data_01_conflictModel.FeasibleList(['-N-Y-', '---NN'])
+        expected = sorted(set(util.yn2dec(yn) for yn in
+                              util.expandPatterns(['-N-Y-', '---NN'])))
+        # list-like access to decimal and ordered values.
+        self.assertEqual(feas.decimal, expected)
+        self.assertEqual(list(feas.ordered), list(range(1, len(expected) + 1)))
+        self.assertEqual(feas.decimal.index(expected[3]), 3)
+        self.assertIn(expected[2], feas.decimal)
+        self.assertNotIn(expected[-1] + 1, feas.decimal)
+        self.assertNotIn([1, 2], feas.ordered)
+        with self.assertRaises(ValueError):
+            feas.decimal.index(expected[-1] + 1)
+        # mappings between formats.
+        self.assertEqual(feas.toOrdered[expected[4]], 5)
+        self.assertEqual(feas.toDecimal[5], expected[4])
+        with self.assertRaises(KeyError):
+            feas.toOrdered[expected[-1] + 1]
+        self.assertEqual(feas.yn[0], util.dec2yn(expected[0], 5))
+        # a sub-list keeps the ordered numbers of its parent.
+        sub = data_01_conflictModel.FeasibleList(['---NN'],
+                                                  toOrdered=feas.toOrdered)
+        self.assertEqual([feas.toOrdered[dec] for dec in sub.decimal],
+                         list(sub.ordered))
+
+
+class TestBitMatrix(unittest.TestCase):
+
+    def test_bitMatrix(self):
+        rng = numpy.random.RandomState(1)
+        a = rng.rand(13, 21) > 0.5
+        b = rng.rand(13, 21) > 0.5
+        bmA = data_02_conflictSolvers.BitMatrix.fromDense(a)
+        bmB = data_02_conflictSolvers.BitMatrix.fromDense(b)
+        self.assertEqual(bmA.shape, (13, 21))
+        numpy.testing.assert_array_equal(bmA.toDense(), a)
+        numpy.testing.assert_array_equal((bmA & bmB).toDense(), a & b)
+        numpy.testing.assert_array_equal((bmA | bmB).toDense(), a | b)
+        numpy.testing.assert_array_equal(bmA.popcount(), a.sum(axis=1))
+        numpy.testing.assert_array_equal(bmA.any(), a.any(axis=1))
+        self.assertEqual(bmA[3, 17], a[3, 17])
+        numpy.testing.assert_array_equal(bmA[4, [0, 9, 20]], a[4, [0, 9, 20]])
+        self.assertEqual(bmA.indexes(5).tolist(), numpy.flatnonzero(a[5]).tolist())
+
+    def test_improvementBits(self):
+        rng = numpy.random.RandomState(2)
+        payoffs = rng.randint(1, 8, (3, 50))
+        diff = payoffs[:, numpy.newaxis, :] - payoffs[:, :, numpy.newaxis]
+        expected = (diff > 0).all(axis=0)
+        for blockSize in [1, 7, 50, 64]:
+            bits = data_02_conflictSolvers.improvementBits(payoffs, blockSize)
+            numpy.testing.assert_array_equal(bits.toDense(), expected)
+
+
+class TestConditions(unittest.TestCase):
+
+    def setUp(self):
+        self.conf = data_01_conflictModel.ConflictModel()
+        self.conf.load_from_file("Examples/Prisoners.gmcr")
+
+    def test_compiledConditions(self):
+        codes = self.conf.feasibles.codes
+        for dm in self.conf.decisionMakers:
+            for pref in dm.preferences:
+                expected = [pref.test(int(dec)) for dec in codes]
+                self.assertEqual(pref.test_many(codes).tolist(), expected)
+            mat = dm.preferences.test_many(codes)
+            self.assertEqual(mat.shape, (len(codes), len(dm.preferences)))
+
+    def test_lexicographicRanking(self):
+        # more statements than fit in a 64 bit weight.
+        opts = self.conf.options
+        feas = self.conf.feasibles
+        rng = numpy.random.RandomState(0)
+        prefs = []
+        for idx in range(70):
+            optIdxs = rng.choice(len(opts), rng.randint(1, 3), replace=False)
+            prefs.append(self.conf.newCondition(
+                [(opts[int(i)], 'YN'[rng.randint(2)]) for i in optIdxs]))
+        payoffs, ranking = util.prefPriorities2payoffs(prefs, feas)
+        scores = [sum(2**(len(prefs) - idx - 1) for idx, pref in
+                      enumerate(prefs) if pref.test(dec))
+                  for dec in feas.decimal]
+        expected = [sorted(set(scores)).index(sc) + 1 for sc in scores]
+        self.assertEqual(payoffs.tolist(), expected)
+        best = [st + 1 for st, sc in enumerate(scores) if sc == max(scores)]
+        self.assertEqual(ranking[0], best if len(best) > 1 else best[0])
+
+    def test_reorderInvalidates(self):
+        opts = self.conf.options
+        cond = self.conf.newCondition([(opts[0], 'Y'), (opts[1], 'N')])
+        self.assertEqual(cond.compile().ynd(len(opts)), 'YN')
+        opts.insert(0, opts.pop(1))
+        self.assertEqual(cond.compile().ynd(len(opts)), 'NY')
+        self.assertTrue(cond.test(0b10))
+        self.assertFalse(cond.test(0b01))
+
 
 class TestSolvers(unittest.TestCase):
 
@@ -99,6 +253,130 @@ class TestSolvers(unittest.TestCase):
             expected = numpy.loadtxt("test_data/" + file + "_logSol.txt")
             numpy.testing.assert_array_equal(expected, solver.allEquilibria, "Incorrect logical solution for " + file)
 
+    def test_groupReachability(self):
+        for file in files + ["Cuban", "Elmira", "SI_misp"]:
+            self.conf.load_from_file("Examples/" + file + ".gmcr")
+            solver = data_02_conflictSolvers.RMGenerator(self.conf)
+            for dm in solver.effectiveDMs:
+                dense = dm.reachability.toDense()
+                self.assertEqual(dense.shape, (len(self.conf.feasibles),) * 2)
+                for state in self.conf.feasibles:
+                    self.assertEqual(solver.reachable(dm, state),
+                                     numpy.nonzero(dense[state])[0].tolist())
+                    improves = dm.improvements.row(state)
+                    self.assertEqual(
+                        solver.UIs(dm, state),
+                        numpy.nonzero(dense[state] & improves)[0].tolist())
+                    # lookups are views of the shared index array, and the
+                    # solvers use them without copying
+                    self.assertIs(dm.reachableMoves[state].base,
+                                  dm.reachableMoves.indices)
+                    self.assertIs(solver._moves(dm, state, True).base,
+                                  dm.improvingMoves.indices)
+                    self.assertEqual(solver._moves(dm, state).tolist(),
+                                     solver.reachable(dm, state))
+
+    def test_coalitionRegrouping(self):
+        def setCoalitions(conf, groups):
+            conf.coalitions.itemList = []
+            for group in groups:
+                dms = [conf.decisionMakers[idx] for idx in group]
+                if len(dms) == 1:
+                    conf.coalitions.append(dms[0])
+                else:
+                    conf.coalitions.append(conf.newCoalition(dms))
+
+        for file in ["Elmira", "SI_misp", "Cuban"]:
+            self.conf.load_from_file("Examples/" + file + ".gmcr")
+            numDMs = len(self.conf.decisionMakers)
+            for groups in [[[0, 1]] + [[idx] for idx in range(2, numDMs)],
+                           [[idx] for idx in range(numDMs)],
+                           [list(range(numDMs))]]:
+                # solvers reuse the data cached on the DMs
+                setCoalitions(self.conf, groups)
+                solver = data_02_conflictSolvers.LogicalSolver(self.conf)
+                solver.findEquilibria()
+                fresh = data_01_conflictModel.ConflictModel()
+                fresh.load_from_file("Examples/" + file + ".gmcr")
+                setCoalitions(fresh, groups)
+                expected = data_02_conflictSolvers.LogicalSolver(fresh)
+                expected.findEquilibria()
+                numpy.testing.assert_array_equal(solver.allEquilibria,
+                                                 expected.allEquilibria)
+                for co, freshCo in zip(solver.effectiveDMs,
+                                       expected.effectiveDMs):
+                    numpy.testing.assert_array_equal(
+                        co.improvements.toDense(),
+                        freshCo.improvements.toDense())
+                    numpy.testing.assert_array_equal(
+                        co.reachableMoves.toDense(),
+                        freshCo.reachableMoves.toDense())
+
+    def test_coalitionStructures(self):
+        partitions = list(data_02_conflictSolvers.setPartitions(range(4)))
+        self.assertEqual(len(partitions), 15)
+        self.assertEqual(partitions[0], [[0, 1, 2, 3]])
+        self.assertEqual(partitions[-1], [[0], [1], [2], [3]])
+
+        self.conf.load_from_file("Examples/Elmira.gmcr")
+        solver = data_02_conflictSolvers.LogicalSolver(self.conf)
+        solver.findEquilibria()
+        original = self.conf.coalitions.export_rep()
+        table = data_02_conflictSolvers.solveCoalitionStructures(self.conf)
+        self.assertEqual(self.conf.coalitions.export_rep(), original)
+        self.assertEqual(len(table), 5)
+        self.assertEqual(table.concepts, solver.conceptNames)
+        numpy.testing.assert_array_equal(table.equilibria[-1],
+                                         solver.allEquilibria)
+        parallel = data_02_conflictSolvers.solveCoalitionStructures(
+            self.conf, workers=2, concepts=["Nash", "SEQ"])
+        numpy.testing.assert_array_equal(parallel.equilibria,
+                                         table.equilibria[:, [0, 2]])
+
+    def test_matrixSol(self):
+        for file in files + ["Cuban", "Elmira", "SI_misp"]:
+            self.conf.load_from_file("Examples/" + file + ".gmcr")
+            logical = data_02_conflictSolvers.LogicalSolver(self.conf)
+            logical.findEquilibria()
+            solver = data_02_conflictSolvers.MatrixCalc(self.conf)
+            solver.findEquilibria()
+            numpy.testing.assert_array_equal(logical.allEquilibria, solver.allEquilibria, "Incorrect matrix solution for " + file)
+            for concept in ["nash", "gmr", "seq", "sim", "smr"]:
+                numpy.testing.assert_array_equal(
+                    getattr(logical, concept + "Stabilities"),
+                    getattr(solver, concept + "Stabilities"))
+
+    def test_parallelSol(self):
+        for file in ["Garrison", "Cuban"]:
+            self.conf.load_from_file("Examples/" + file + ".gmcr")
+            serial = data_02_conflictSolvers.LogicalSolver(self.conf)
+            serial.findEquilibria()
+            parallel = data_02_conflictSolvers.LogicalSolver(self.conf)
+            parallel.findEquilibria(workers=2)
+            numpy.testing.assert_array_equal(serial.allEquilibria, parallel.allEquilibria)
+            for concept in ["nash", "gmr", "seq", "sim", "smr"]:
+                numpy.testing.assert_array_equal(
+                    getattr(serial, concept + "Stabilities"),
+                    getattr(parallel, concept + "Stabilities"))
+
+    def test_selectedConcepts(self):
+        for file in files:
+            self.conf.load_from_file("Examples/" + file + ".gmcr")
+            full = data_02_conflictSolvers.LogicalSolver(self.conf)
+            full.findEquilibria()
+            quick = data_02_conflictSolvers.LogicalSolver(self.conf)
+            quick.findEquilibria(equilibriaOnly=True)
+            numpy.testing.assert_array_equal(full.allEquilibria, quick.allEquilibria)
+            quick.findEquilibria(concepts=["Nash", "GMR"], equilibriaOnly=True)
+            numpy.testing.assert_array_equal(full.allEquilibria[:2], quick.allEquilibria)
+            self.assertIsNone(quick.smrStabilities)
+            quick.findEquilibria(concepts=["SEQ&SIM"], equilibriaOnly=True)
+            numpy.testing.assert_array_equal(full.allEquilibria[4:5], quick.allEquilibria)
+        with self.assertRaisesRegex(ValueError, "Unknown stability concept"):
+            quick.findEquilibria(concepts=["Bogus"])
+        with self.assertRaisesRegex(ValueError, "No stability concepts"):
+            quick.findEquilibria(concepts=[])
+
     def test_splogSol(self):
         for file in files:
             self.conf.load_from_file("Examples/" + file + ".gmcr")
@@ -107,6 +385,84 @@ class TestSolvers(unittest.TestCase):
             expected = numpy.loadtxt("test_data/" + file + "_logSol.txt")
             numpy.testing.assert_array_equal(expected, solver.allEquilibria, "Incorrect logical solution for " + file)
 
+    def test_sanctionCache(self):
+        self.conf.load_from_file("Examples/Garrison.gmcr")
+        solver = data_02_conflictSolvers.LogicalSolver(self.conf)
+        solver.findEquilibria()
+        self.assertGreater(solver.sanctionCacheStats['hits'], 0)
+        self.assertGreater(solver.sanctionCacheHitRate(), 0)
+        # sanctions found agree with the narrated depth first search.
+        for dm in solver.effectiveDMs:
+            others = [d for d in solver.effectiveDMs if d is not dm]
+            for state0 in range(len(self.conf.feasibles)):
+                for state1 in solver.UIs(dm, state0):
+                    for uiOnly, countermove in [(False, False), (True, False),
+                                                (False, True)]:
+                        fast = solver.checkSanctions(dm, others, state0, state1,
+                                                     uiOnly, countermove, False)
+                        slow = solver.checkSanctions(dm, others, state0, state1,
+                                                     uiOnly, countermove, True)
+                        self.assertEqual((fast[0], fast[2]), (slow[0], slow[2]))
+
+        # the cache is kept within its limit, without changing results.
+        bounded = data_02_conflictSolvers.LogicalSolver(self.conf)
+        bounded.sanctionCacheLimit = 40
+        bounded.findEquilibria()
+        self.assertLessEqual(bounded.sanctionCacheSize, 40)
+        self.assertLessEqual(sum(map(len, bounded.sanctionCache.values())), 40)
+        numpy.testing.assert_array_equal(bounded.allEquilibria, solver.allEquilibria)
+
+    def test_simStability(self):
+        # every UI must be checked against all simultaneous opponent moves.
+        rng = numpy.random.RandomState(0)
+        for dmIdx in range(3):
+            dm = data_01_conflictModel.DecisionMaker(self.conf, str(dmIdx))
+            self.conf.decisionMakers.append(dm)
+            dm.addOption('a' + str(dmIdx))
+            dm.addOption('b' + str(dmIdx))
+        self.conf.recalculateFeasibleStates()
+        opts = self.conf.options
+        for dm in self.conf.decisionMakers:
+            for optIdx in rng.permutation(len(opts))[:4]:
+                dm.preferences.append([(opts[int(optIdx)], 'YN'[rng.randint(2)])])
+        logical = data_02_conflictSolvers.LogicalSolver(self.conf)
+        logical.findEquilibria()
+        matrix = data_02_conflictSolvers.MatrixCalc(self.conf)
+        matrix.findEquilibria()
+        numpy.testing.assert_array_equal(logical.simStabilities,
+                                         matrix.simStabilities)
+
+    def test_explain(self):
+        self.conf.load_from_file("Examples/Prisoners.gmcr")
+        solver = data_02_conflictSolvers.LogicalSolver(self.conf)
+        dm = solver.effectiveDMs[0]
+        for state in self.conf.feasibles:
+            for concept in ["Nash", "GMR", "SEQ", "SIM", "SMR"]:
+                method = getattr(solver, concept.lower())
+                stable, narration = method(dm, state)
+                self.assertEqual(solver.explain(dm, state, concept), narration)
+                self.assertEqual(method(dm, state, narrate=False),
+                                 (stable, None))
+        with self.assertRaises(ValueError):
+            solver.explain(dm, 0, "Bogus")
+
+    def test_isStable(self):
+        for file in ["Elmira", "SI_misp", "SyriaIraq"]:
+            self.conf.load_from_file("Examples/" + file + ".gmcr")
+            solver = data_02_conflictSolvers.LogicalSolver(self.conf)
+            solver.findEquilibria()
+            lazy = data_02_conflictSolvers.LazySolver(self.conf)
+            for idx, concept in enumerate(solver.conceptNames):
+                for state in self.conf.feasibles:
+                    self.assertEqual(
+                        lazy.is_stable(state, concept),
+                        bool(solver.allEquilibria[idx, state]),
+                        "{} {} state {}".format(file, concept, state))
+                    self.assertEqual(lazy.is_stable(state, concept),
+                                     solver.is_stable(state, concept))
+        with self.assertRaises(ValueError):
+            lazy.is_stable(0, "Bogus")
+
     # def test_narration(self):
     #     for file in files:
     #         self.conf.load_from_file("Examples/" + file + ".gmcr")
@@ -141,6 +497,95 @@ class TestSolvers(unittest.TestCase):
                 expected = numpy.loadtxt("test_data/%s_%s_invSol.txt"%(file, desEq))
                 numpy.testing.assert_array_equal(expected, solver.equilibriums, "Incorrect inverse results for %s_%s"%(file, desEq))
 
+    def test_inverseStreaming(self):
+        self.conf.load_from_file("Examples/SyriaIraq.gmcr")
+        varyRanges = [[0, 4] for dm in self.conf.decisionMakers]
+        solver = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, 1)
+        solver.findEquilibria()
+        full = solver.equilibriums
+        allRankings = solver.preferenceRankings
+        numpy.testing.assert_array_equal(solver.counts, full.sum(axis=1))
+
+        filt = [False, True, False, False]
+        solver.findEquilibria(filt=filt, chunkSize=7)
+        matches = full[1]
+        self.assertEqual(solver.numRankings, len(allRankings))
+        numpy.testing.assert_array_equal(solver.equilibriums, full[:, matches])
+        self.assertEqual(solver.preferenceRankings,
+                         [r for r, m in zip(allRankings, matches) if m])
+        numpy.testing.assert_array_equal(solver.counts, full.sum(axis=1))
+
+        solver.findEquilibria(countOnly=True, chunkSize=5)
+        self.assertIsNone(solver.preferenceRankings)
+        numpy.testing.assert_array_equal(solver.counts, full.sum(axis=1))
+
+    def test_inverseSearch(self):
+        rng = numpy.random.RandomState(1)
+        concepts = ['Nash', 'SEQ', 'GMR', 'SMR']
+        for file in ["Prisoners", "SyriaIraq", "Elmira"]:
+            self.conf.load_from_file("Examples/%s.gmcr"%(file))
+            for trial in range(3):
+                varyRanges = []
+                for dm in self.conf.decisionMakers:
+                    n = len(dm.preferenceRanking)
+                    start = rng.randint(0, n - 1)
+                    varyRanges.append([start, min(n, start + rng.randint(2, 5))])
+                desEq = rng.randint(len(self.conf.feasibles))
+                solver = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, desEq)
+                solver.findEquilibria()
+                for idx, concept in enumerate(concepts):
+                    expected = [r for r, eq in zip(solver.preferenceRankings,
+                                                   solver.equilibriums[idx]) if eq]
+                    found = list(solver.validRankings(concept))
+                    self.assertEqual(sorted(map(repr, found)), sorted(map(repr, expected)),
+                                     "Incorrect %s search for %s_%s"%(concept, file, desEq))
+                full = solver.counts
+                searched = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, desEq)
+                searched.findEquilibria(search='GMR')
+                self.assertEqual(searched.counts[2], full[2])
+                self.assertTrue(searched.equilibriums[2].all())
+        self.assertRaises(ValueError, next, solver.validRankings('SIM'))
+
+    def test_inverseCounting(self):
+        rng = numpy.random.RandomState(2)
+        for file in ["Prisoners", "SyriaIraq", "Elmira", "Garrison"]:
+            self.conf.load_from_file("Examples/%s.gmcr"%(file))
+            for trial in range(3):
+                varyRanges = []
+                for dm in self.conf.decisionMakers:
+                    n = len(dm.preferenceRanking)
+                    start = rng.randint(0, max(n - 1, 1))
+                    varyRanges.append([start, min(n, start + rng.randint(0, 5))])
+                desEq = rng.randint(len(self.conf.feasibles))
+                solver = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, desEq)
+                solver.findEquilibria(countOnly=True)
+                counted = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, desEq)
+                counted.countEquilibria()
+                numpy.testing.assert_array_equal(counted.counts, solver.counts,
+                                                 "Incorrect counts for %s_%s"%(file, desEq))
+                self.assertEqual(counted.numRankings, solver.numRankings)
+
+        counted.sampleEquilibria(500, seed=4)
+        first = counted.sampleCounts.copy()
+        counted.sampleEquilibria(500, seed=4, chunkSize=64)
+        numpy.testing.assert_array_equal(counted.sampleCounts, first)
+        self.assertEqual(counted.numSamples, 500)
+        self.assertTrue((counted.intervals[:, 0] <= counted.estimates).all())
+        self.assertTrue((counted.estimates <= counted.intervals[:, 1]).all())
+        self.assertTrue((counted.intervals[:, 1] <= counted.numRankings).all())
+
+    def test_inverseParallel(self):
+        self.conf.load_from_file("Examples/Garrison.gmcr")
+        varyRanges = [[0, 4], [2, 5], [0, 3], [0, 0]]
+        serial = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, 1)
+        serial.findEquilibria()
+        parallel = data_02_conflictSolvers.InverseSolver(self.conf, varyRanges, 1)
+        parallel.findEquilibria(workers=3, chunkSize=50)
+        self.assertEqual(parallel.preferenceRankings, serial.preferenceRankings)
+        numpy.testing.assert_array_equal(parallel.equilibriums, serial.equilibriums)
+        numpy.testing.assert_array_equal(parallel.counts, serial.counts)
+        self.assertEqual(parallel.numRankings, serial.numRankings)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -70,6 +70,8 @@ class FeasDisp(ttk.Frame):
         if fmt == "ord_dec":
             feas = self.conflict.feasibles.ordDec
         self.dispList.set(tuple(feas))
+        self.feasText['text'] = 'Feasible States ({} in {} patterns)'.format(
+            len(self.conflict.feasibles), len(self.conflict.feasibles.dash))
 
 
 def main():
@@ -71,6 +71,8 @@ class FeasDisp(ttk.Frame):
         if fmt == "ord_dec":
             perc = self.activeDM.perceived.ordDec
         self.dispList.set(tuple(perc))
+        self.feasText['text'] = 'Perceived States ({} in {} patterns)'.format(
+            len(self.activeDM.perceived), len(self.activeDM.perceived.dash))
 
 
 def main():
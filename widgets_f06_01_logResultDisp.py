@@ -390,17 +390,9 @@ class LogNarrator(ttk.Frame):
             dm = self.conflict.decisionMakers[self.dmSel.current()]
         state = self.stateSel.current()
         eqType = self.eqTypeVar.get()
-        if eqType == "Nash":
-            newText = self.owner.sol.nash(dm, state)[1]
-        elif eqType == 'GMR':
-            newText = self.owner.sol.gmr(dm, state)[1]
-        elif eqType == 'SEQ':
-            newText = self.owner.sol.seq(dm, state)[1]
-        elif eqType == 'SIM':
-            newText = self.owner.sol.sim(dm, state)[1]
-        elif eqType == 'SMR':
-            newText = self.owner.sol.smr(dm, state)[1]
-        else:
+        try:
+            newText = self.owner.sol.explain(dm, state, eqType)
+        except ValueError:
             newText = "Error: bad equilibrium type selected."
         self.equilibriumNarrator.insert('1.0', newText)
 
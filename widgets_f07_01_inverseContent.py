@@ -252,7 +252,8 @@ class InverseContent(ttk.Frame):
     def refreshSolution(self, *args):
         self.sol = InverseSolver(self.conflict, self.vary,
                                  self.desiredEquilibria)
-        self.sol.findEquilibria()
+        self.sol.countEquilibria()
+        self.counts = self.sol.counts
         self.filter()
 
     def filter(self, *args):
@@ -260,11 +261,16 @@ class InverseContent(ttk.Frame):
         for chld in self.resDisp.get_children():
             self.resDisp.delete(chld)
 
-        res, counts = self.sol.filter(filt)
-
         if bool(int(self.displayPermutations.get())):
+            # only search the rankings that meet the first concept selected
+            search = [concept for concept, selected in
+                      zip(['Nash', 'SEQ', 'GMR', 'SMR'], filt) if selected]
+            self.sol.findEquilibria(filt=filt,
+                                    search=search[0] if search else None)
+            res = self.sol.filter(filt)[0]
             for pRanki, pRank in enumerate(res):
                 self.resDisp.insert('', 'end', iid=str(pRanki), values=pRank)
+        counts = self.counts
 
         self.nashCountVar.set('{} Nash'.format(counts[0]))
         self.seqCountVar.set('{} SEQ'.format(counts[1]))